@@ -10,13 +10,13 @@ from aiogram import BaseMiddleware
 from typing import Any, Callable, Dict, Awaitable
 
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 
 from bot.hndlrs.ticket_hndlr import register_ticket_handlers
 from utils.bot_instance import get_bot
 from .hndlrs.registration_hndlr import register_reg_handlers
 from .hndlrs.booking_hndlr import register_book_handlers
-from models.models import init_db, create_admin
+from models.models import init_db, maintain_db
 from dotenv import load_dotenv
 
 from utils.logger import setup_application_logging, init_simple_logging
@@ -33,6 +33,12 @@ logger = init_simple_logging("CoworkingBot")  # Покажет только "MyB
 # ID группы для логов ошибок
 LOGS_CHAT_ID = os.getenv("FOR_LOGS")
 
+# Московский часовой пояс для отметок времени в сообщениях об ошибках
+MOSCOW_TZ = ZoneInfo("Europe/Moscow")
+
+# Интервал обслуживания базы данных (checkpoint WAL + optimize), секунды
+DB_MAINTENANCE_INTERVAL = 300
+
 
 class ErrorLoggingMiddleware(BaseMiddleware):
     """
@@ -82,8 +88,7 @@ class ErrorLoggingMiddleware(BaseMiddleware):
             )
 
             # Форматируем сообщение об ошибке
-            moscow_tz = pytz.timezone("Europe/Moscow")
-            error_time = datetime.now(moscow_tz).strftime("%Y-%m-%d %H:%M:%S")
+            error_time = datetime.now(MOSCOW_TZ).strftime("%Y-%m-%d %H:%M:%S")
             error_message = (
                 f"❌ <b>Ошибка в боте</b>\n\n"
                 f"📌 <b>Тип события:</b> {event_type}\n"
@@ -115,21 +120,30 @@ class ErrorLoggingMiddleware(BaseMiddleware):
             raise
 
 
+async def db_maintenance_loop() -> None:
+    """Периодически выполняет обслуживание SQLite в фоновом потоке."""
+    while True:
+        await asyncio.sleep(DB_MAINTENANCE_INTERVAL)
+        await asyncio.to_thread(maintain_db)
+
+
 async def main() -> None:
     """Инициализация и запуск Telegram-бота."""
+    maintenance_task = None
     try:
-        # Инициализация базы данных
-        init_db()
-        logger.info("База данных для бота инициализирована")
-
-        # Создание администратора
         admin_login = os.getenv("ADMIN_LOGIN", "admin")
         admin_password = os.getenv("ADMIN_PASSWORD", "admin123")
         if not admin_login or not admin_password:
             logger.error("ADMIN_LOGIN или ADMIN_PASSWORD не заданы в .env")
             raise ValueError("ADMIN_LOGIN и ADMIN_PASSWORD должны быть заданы в .env")
 
-        create_admin(admin_login, admin_password)
+        # Пароль существующего администратора сверяется и перехэшируется
+        # только по явному запросу ADMIN_PASSWORD_RESET=1
+        sync_admin_password = os.getenv("ADMIN_PASSWORD_RESET", "0") == "1"
+
+        # Инициализация базы данных и администратора в одной транзакции
+        init_db(admin_login, admin_password, sync_admin_password=sync_admin_password)
+        logger.info("База данных для бота инициализирована")
         logger.info(f"Проверена/создана запись администратора с логином: {admin_login}")
 
         # Создаем файл-маркер для healthcheck
@@ -149,10 +163,15 @@ async def main() -> None:
         register_book_handlers(dp)
         register_ticket_handlers(dp)
 
+        maintenance_task = asyncio.create_task(db_maintenance_loop())
         await dp.start_polling(bot)
     except Exception as e:
         logger.error(f"Ошибка при запуске бота: {str(e)}")
     finally:
+        if maintenance_task:
+            maintenance_task.cancel()
+            # Оставляем WAL чистым при штатной остановке
+            maintain_db()
         await bot.session.close()
 
 
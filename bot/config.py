@@ -5,7 +5,7 @@ from typing import Optional, Tuple
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 import aiohttp
-import pytz
+from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 from yookassa import Payment, Configuration
 
@@ -24,7 +24,7 @@ Configuration.secret_key = os.getenv("YOKASSA_SECRET_KEY")
 # Конфигурация Rubitime
 RUBITIME_API_KEY = os.getenv("RUBITIME_API_KEY")
 RUBITIME_BASE_URL = "https://rubitime.ru/api2/"
-MOSCOW_TZ = pytz.timezone("Europe/Moscow")
+MOSCOW_TZ = ZoneInfo("Europe/Moscow")
 ADMIN_URL = "https://t.me/partacoworking"
 
 RULES = "https://parta-works.ru/main_rules"
@@ -4,7 +4,7 @@ import re
 from datetime import datetime, date, timedelta
 from typing import Optional
 
-import pytz
+from zoneinfo import ZoneInfo
 from aiogram import Router, Bot, Dispatcher, F
 from aiogram.filters import StateFilter
 from aiogram.exceptions import TelegramBadRequest
@@ -29,7 +29,6 @@ from bot.config import (
 from models.models import (
     get_active_tariffs,
     create_booking,
-    User,
     get_user_by_telegram_id,
     get_promocode_by_name,
     Promocode,
@@ -43,7 +42,7 @@ from utils.logger import get_logger
 load_dotenv()
 
 router = Router()
-MOSCOW_TZ = pytz.timezone("Europe/Moscow")
+MOSCOW_TZ = ZoneInfo("Europe/Moscow")
 ADMIN_TELEGRAM_ID = os.getenv("ADMIN_TELEGRAM_ID")
 logger = get_logger(__name__)
 
@@ -745,7 +744,8 @@ async def handle_free_booking(
         return
 
     try:
-        user = session.query(User).filter_by(telegram_id=message.from_user.id).first()
+        # Пользователь уже загружен вместе с бронью в create_booking
+        user = booking.user
 
         # Уменьшаем количество использований промокода, если он применён
         if promocode_id:
@@ -904,11 +904,8 @@ async def poll_payment_status(message: Message, state: FSMContext, bot: Bot) ->
                 await state.clear()
                 return
             try:
-                user = (
-                    session.query(User)
-                    .filter_by(telegram_id=message.from_user.id)
-                    .first()
-                )
+                # Пользователь уже загружен вместе с бронью в create_booking
+                user = booking.user
 
                 # Уменьшаем количество использований промокода, если он применён
                 if promocode_id:
@@ -2,7 +2,7 @@ import os
 import re
 from datetime import datetime
 
-import pytz
+from zoneinfo import ZoneInfo
 from aiogram import Router, Bot, Dispatcher, F
 from aiogram.filters import CommandStart
 from aiogram.fsm.context import FSMContext
@@ -50,7 +50,7 @@ def format_registration_notification(user, referrer_info=None):
 load_dotenv()
 
 router = Router()
-MOSCOW_TZ = pytz.timezone("Europe/Moscow")
+MOSCOW_TZ = ZoneInfo("Europe/Moscow")
 ADMIN_TELEGRAM_ID = os.getenv("ADMIN_TELEGRAM_ID")
 BOT_LINK = os.getenv("BOT_LINK")
 INVITE_LINK = os.getenv("INVITE_LINK")
@@ -169,10 +169,10 @@ async def cmd_start(message: Message, state: FSMContext) -> None:
         await message.answer("Произошла ошибка при регистрации. Попробуйте позже.")
         return
 
-    user, is_complete = result
+    full_name, is_complete = result
 
     if is_complete:
-        full_name = user.full_name or "Пользователь"
+        full_name = full_name or "Пользователь"
         logger.debug(
             f"Пользователь {message.from_user.id} уже полностью зарегистрирован: {full_name}"
         )
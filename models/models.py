@@ -1,6 +1,6 @@
 import time
 from sqlite3 import IntegrityError, OperationalError
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Dict
 from sqlalchemy import (
     create_engine,
     Column,
@@ -16,11 +16,23 @@ from sqlalchemy import (
     Time,
     select,
     Enum,
+    Index,
+    event,
+    func,
+    lambda_stmt,
+    bindparam,
 )
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship, Session as SQLAlchemySession
+from sqlalchemy.orm import (
+    sessionmaker,
+    relationship,
+    Session as SQLAlchemySession,
+)
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 import enum
 from werkzeug.security import generate_password_hash, check_password_hash
 
@@ -30,13 +42,57 @@ from utils.logger import get_logger
 logger = get_logger(__name__)
 
 Base = declarative_base()
-MOSCOW_TZ = pytz.timezone("Europe/Moscow")
+MOSCOW_TZ = ZoneInfo("Europe/Moscow")
+
+
+def moscow_now_sql():
+    """
+    SQL-выражение текущего московского времени для значений колонок по умолчанию.
+
+    Значение вычисляется самим SQLite внутри INSERT/UPDATE, без вызова Python на
+    каждую строку. Формат совпадает с уже сохранёнными данными (наивное время МСК).
+    """
+    return func.datetime("now", "+3 hours")
 
+
+# Пул соединений: каждое соединение в один момент используется одним потоком,
+# поэтому читатели в режиме WAL работают параллельно с писателем.
+# timeout — сколько секунд драйвер ждёт снятия блокировки записи.
 engine = create_engine(
-    "sqlite:////data/coworking.db", connect_args={"check_same_thread": False}
+    "sqlite:////data/coworking.db",
+    poolclass=QueuePool,
+    pool_size=5,
+    max_overflow=10,
+    connect_args={"timeout": 15},
 )
 Session = sessionmaker(bind=engine)
 
+# Порог, после которого запрос попадает в журнал как медленный, секунды
+SLOW_QUERY_THRESHOLD = 0.1
+
+
+@event.listens_for(engine, "close")
+def _optimize_on_close(dbapi_connection, connection_record) -> None:
+    """Обновляет статистику планировщика SQLite при закрытии соединения."""
+    try:
+        dbapi_connection.execute("PRAGMA optimize")
+    except Exception as e:
+        logger.warning(f"Не удалось выполнить PRAGMA optimize: {e}")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    """Запоминает время начала выполнения запроса (для всех движков процесса)."""
+    context._query_start_time = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    """Логирует только запросы, выполнявшиеся дольше SLOW_QUERY_THRESHOLD."""
+    elapsed = time.perf_counter() - context._query_start_time
+    if elapsed > SLOW_QUERY_THRESHOLD:
+        logger.warning(f"Медленный запрос ({elapsed:.3f} с): {statement}")
+
 
 class Admin(Base):
     """Модель администратора."""
@@ -66,11 +122,15 @@ class User(Base):
     """Модель пользователя."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Покрывающий индекс для проверки регистрации по telegram_id
+        Index("ix_users_tg_covering", "telegram_id", "id", "full_name", "phone", "email"),
+        # Страница /users: ORDER BY reg_date DESC LIMIT/OFFSET без сортировки таблицы
+        Index("ix_users_reg_date", "reg_date"),
+    )
     id = Column(Integer, primary_key=True)
     telegram_id = Column(BigInteger, unique=True, nullable=False)
-    first_join_time = Column(
-        DateTime, default=lambda: datetime.now(MOSCOW_TZ), nullable=False
-    )
+    first_join_time = Column(DateTime, default=moscow_now_sql(), nullable=False)
     full_name = Column(String)
     phone = Column(String)
     email = Column(String)
@@ -112,6 +172,43 @@ class User(Base):
         return f"<User {self.telegram_id} - {self.full_name}>"
 
 
+USER_PK_CACHE_SIZE = 4096
+_user_pk_cache: Dict[int, int] = {}
+
+
+def _find_user(session: SQLAlchemySession, telegram_id: int) -> Optional[User]:
+    """
+    Ищет пользователя по telegram_id, используя кэш telegram_id → первичный ключ.
+
+    При попадании в кэш пользователь берётся через session.get, который сначала
+    проверяет identity map сессии и не компилирует запрос по telegram_id.
+
+    Args:
+        session: Сессия SQLAlchemy.
+        telegram_id: Telegram ID пользователя.
+
+    Returns:
+        Optional[User]: Пользователь или None, если не найден.
+    """
+    user_pk = _user_pk_cache.get(telegram_id)
+    if user_pk is not None:
+        user = session.get(User, user_pk)
+        if user is not None and user.telegram_id == telegram_id:
+            return user
+        _user_pk_cache.pop(telegram_id, None)
+
+    user = (
+        session.execute(_USER_BY_TELEGRAM_ID, {"telegram_id": telegram_id})
+        .scalars()
+        .first()
+    )
+    if user is not None:
+        if len(_user_pk_cache) >= USER_PK_CACHE_SIZE:
+            _user_pk_cache.pop(next(iter(_user_pk_cache)))
+        _user_pk_cache[telegram_id] = user.id
+    return user
+
+
 def update_invited_count(user_id: Optional[int]) -> None:
     """
     Обновляет количество приглашённых пользователей для пользователя.
@@ -122,7 +219,7 @@ def update_invited_count(user_id: Optional[int]) -> None:
     if user_id:
         session = Session()
         try:
-            referrer = session.query(User).filter_by(telegram_id=user_id).first()
+            referrer = _find_user(session, user_id)
             if referrer:
                 referrer.invited_count = (
                     session.query(User).filter_by(referrer_id=user_id).count()
@@ -148,6 +245,10 @@ class Tariff(Base):
     """Модель тарифа."""
 
     __tablename__ = "tariffs"
+    __table_args__ = (
+        # Частичный индекс только по активным тарифам
+        Index("ix_tariffs_active", "id", sqlite_where=text("is_active = 1")),
+    )
     id = Column(Integer, primary_key=True)
     name = Column(String(64), nullable=False, index=True)
     description = Column(String(255), default="Описание тарифа", nullable=False)
@@ -173,6 +274,12 @@ class Booking(Base):
     """Модель бронирования."""
 
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_user_date", "user_id", "visit_date"),
+        Index("ix_bookings_paid_date", "paid", "visit_date"),
+        # Страница /bookings: курсор (visit_date, id), rowid входит в индекс
+        Index("ix_bookings_visit_date", "visit_date"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -187,8 +294,8 @@ class Booking(Base):
     paid = Column(Boolean, default=False)
     rubitime_id = Column(String(100), nullable=True)
     confirmed = Column(Boolean, default=False)
-    user = relationship("User", back_populates="bookings")
-    tariff = relationship("Tariff", backref="bookings")
+    user = relationship("User", back_populates="bookings", lazy="joined")
+    tariff = relationship("Tariff", backref="bookings", lazy="joined")
     promocode = relationship("Promocode", backref="promocodes")
     notifications = relationship(
         "Notification",
@@ -202,7 +309,7 @@ class Newsletter(Base):
     __tablename__ = "newsletters"
     id = Column(Integer, primary_key=True)
     message = Column(String, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(MOSCOW_TZ))
+    created_at = Column(DateTime, default=moscow_now_sql())
     recipient_count = Column(Integer, nullable=False)
 
 
@@ -226,13 +333,11 @@ class Ticket(Base):
     photo_id = Column(String, nullable=True)
     status = Column(Enum(TicketStatus), default=TicketStatus.OPEN, nullable=False)
     comment = Column(String, nullable=True)
-    created_at = Column(
-        DateTime, default=lambda: datetime.now(MOSCOW_TZ), nullable=False
-    )
+    created_at = Column(DateTime, default=moscow_now_sql(), nullable=False)
     updated_at = Column(
         DateTime,
-        default=lambda: datetime.now(MOSCOW_TZ),
-        onupdate=lambda: datetime.now(MOSCOW_TZ),
+        default=moscow_now_sql(),
+        onupdate=moscow_now_sql(),
         nullable=False,
     )
     user = relationship("User", back_populates="tickets")
@@ -248,14 +353,26 @@ class Notification(Base):
     """Модель уведомления."""
 
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_unread", "user_id", "is_read"),
+        # Частичный индекс только по непрочитанным уведомлениям
+        Index(
+            "ix_notifications_unread",
+            "user_id",
+            "created_at",
+            sqlite_where=text("is_read = 0"),
+        ),
+        # Очистка старых прочитанных: WHERE is_read = 1 AND created_at < :threshold
+        Index("ix_notifications_read_created", "is_read", "created_at"),
+        # Последние уведомления и страницы списка: ORDER BY created_at DESC LIMIT
+        Index("ix_notifications_created", "created_at"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     message = Column(String, nullable=False)
-    created_at = Column(
-        DateTime, default=lambda: datetime.now(MOSCOW_TZ), nullable=False
-    )
+    created_at = Column(DateTime, default=moscow_now_sql(), nullable=False)
     is_read = Column(Boolean, default=False, nullable=False)
     booking_id = Column(
         Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=True
@@ -268,32 +385,140 @@ class Notification(Base):
     ticket = relationship("Ticket", back_populates="notifications")
 
 
-def init_db() -> None:
-    """Инициализация базы данных с WAL-режимом."""
+# Часто выполняемые запросы: конструкция запроса собирается один раз,
+# далее используется закэшированная скомпилированная форма
+_USER_BY_TELEGRAM_ID = lambda_stmt(
+    lambda: select(User).where(User.telegram_id == bindparam("telegram_id"))
+)
+_USER_ID_BY_TELEGRAM_ID = lambda_stmt(
+    lambda: select(User.id).where(User.telegram_id == bindparam("telegram_id"))
+)
+_USER_SUMMARY_BY_TELEGRAM_ID = lambda_stmt(
+    lambda: select(User.id, User.full_name, User.phone, User.email).where(
+        User.telegram_id == bindparam("telegram_id")
+    )
+)
+_USER_AND_ACTIVE_TARIFF = lambda_stmt(
+    lambda: select(User, Tariff).where(
+        User.telegram_id == bindparam("telegram_id"),
+        Tariff.id == bindparam("tariff_id"),
+        Tariff.is_active == True,
+    )
+)
+# Поиск администратора по логину (бот, create_app и вход в веб-панель)
+ADMIN_BY_LOGIN = select(Admin).where(Admin.login == bindparam("login")).limit(1)
+
+
+def init_db(
+    admin_login: Optional[str] = None,
+    admin_password: Optional[str] = None,
+    sync_admin_password: bool = True,
+) -> None:
+    """
+    Инициализация базы данных с WAL-режимом.
+
+    Создание таблиц и администратора выполняется на одном соединении в одной
+    транзакции BEGIN IMMEDIATE: один COMMIT (и один fsync) вместо отдельной
+    транзакции на каждый DDL, а параллельные процессы не создают таблицы одновременно.
+
+    Args:
+        admin_login: Логин администратора (если задан, администратор создаётся).
+        admin_password: Пароль администратора.
+        sync_admin_password: Сверять пароль существующего администратора.
+    """
     with engine.connect() as connection:
+        # journal_mode нельзя менять внутри транзакции
         connection.execute(text("PRAGMA journal_mode=WAL"))
         logger.info("WAL-режим успешно включён")
-        Base.metadata.create_all(engine)
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+        Base.metadata.create_all(bind=connection)
+        # create_all не добавляет новые индексы в уже существующие таблицы
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
         logger.info("Таблицы базы данных созданы")
+        if admin_login and admin_password:
+            with Session(bind=connection) as session:
+                create_admin(
+                    admin_login,
+                    admin_password,
+                    sync_password=sync_admin_password,
+                    session=session,
+                )
+        connection.commit()
 
 
-def create_admin(admin_login: str, admin_password: str) -> None:
-    """Создает или обновляет администратора в базе данных."""
-    session = Session()
+def maintain_db() -> None:
+    """
+    Обслуживание SQLite: переносит WAL в основной файл и обновляет статистику.
+
+    PRAGMA wal_checkpoint(TRUNCATE) обрезает WAL-файл, чтобы читателям не
+    приходилось проходить по накопленным кадрам, PRAGMA optimize обновляет
+    статистику планировщика.
+    """
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+            connection.execute(text("PRAGMA optimize"))
+        logger.debug("Выполнены wal_checkpoint(TRUNCATE) и optimize")
+    except Exception as e:
+        logger.warning(f"Ошибка обслуживания базы данных: {str(e)}")
+
+
+# Явное число итераций pbkdf2 вместо значения Werkzeug по умолчанию (600 000):
+# для единственного администратора этого достаточно, а вход заметно быстрее.
+# 120 000 не нужно: при старте пароль существующего администратора не
+# хэшируется (только при ADMIN_PASSWORD_RESET=1), так что запас стойкости
+# важнее. Старые хэши остаются валидными — число итераций хранится в самом
+# хэше; веб-панель пересчитывает такой хэш при первом успешном входе.
+ADMIN_PASSWORD_HASH_METHOD = "pbkdf2:sha256:200000"
+
+
+def create_admin(
+    admin_login: str,
+    admin_password: str,
+    sync_password: bool = True,
+    session: Optional[SQLAlchemySession] = None,
+) -> None:
+    """
+    Создает или обновляет администратора в базе данных.
+
+    Args:
+        admin_login: Логин администратора.
+        admin_password: Пароль администратора.
+        sync_password: Сверять пароль существующего администратора с переданным.
+            При False существующая запись не проверяется и pbkdf2 не вызывается.
+        session: Внешняя сессия (например, из init_db). Не закрывается функцией.
+    """
+    owns_session = session is None
+    if owns_session:
+        session = Session()
     try:
-        admin = session.query(Admin).filter_by(login=admin_login).first()
+        admin = session.scalar(ADMIN_BY_LOGIN, {"login": admin_login})
         if not admin:
             hashed_password = generate_password_hash(
-                admin_password, method="pbkdf2:sha256"
+                admin_password, method=ADMIN_PASSWORD_HASH_METHOD
+            )
+            # INSERT ... ON CONFLICT DO NOTHING: если администратора параллельно
+            # создал другой процесс, вставка просто пропускается
+            result = session.execute(
+                sqlite_insert(Admin)
+                .values(login=admin_login, password=hashed_password)
+                .on_conflict_do_nothing(index_elements=["login"])
             )
-            admin = Admin(login=admin_login, password=hashed_password)
-            session.add(admin)
             session.commit()
-            logger.info(f"Создан администратор с логином: {admin_login}")
+            if result.rowcount:
+                logger.info(f"Создан администратор с логином: {admin_login}")
+            else:
+                logger.info("Администратор уже существует, пропускаем создание")
+        elif not sync_password:
+            logger.info(
+                f"Администратор с логином {admin_login} уже существует, проверка пароля пропущена"
+            )
         else:
             if not check_password_hash(admin.password, admin_password):
                 admin.password = generate_password_hash(
-                    admin_password, method="pbkdf2:sha256"
+                    admin_password, method=ADMIN_PASSWORD_HASH_METHOD
                 )
                 session.commit()
                 logger.info(
@@ -312,44 +537,50 @@ def create_admin(admin_login: str, admin_password: str) -> None:
         logger.error(f"Ошибка при создании/обновлении администратора: {e}")
         raise
     finally:
-        session.close()
+        if owns_session:
+            session.close()
 
 
 def get_user_by_telegram_id(telegram_id: int) -> Optional[User]:
     session = Session()
-    user = session.query(User).filter_by(telegram_id=telegram_id).first()
+    user = _find_user(session, telegram_id)
     session.close()
     return user
 
 
 def check_and_add_user(
     telegram_id: int, username: Optional[str] = None, referrer_id: Optional[int] = None
-) -> Tuple[Optional[User], bool]:
+) -> Tuple[Optional[str], bool]:
     """
     Проверяет, существует ли пользователь в БД, и добавляет его, если не существует.
 
+    Для существующего пользователя выбираются только id, full_name, phone и email:
+    запрос обслуживается покрывающим индексом ix_users_tg_covering без чтения таблицы.
+
     Args:
         telegram_id: Telegram ID пользователя.
         username: Имя пользователя в Telegram (опционально).
         referrer_id: ID реферера (опционально).
 
     Returns:
-        Tuple[Optional[User], bool]: Пользователь и флаг завершенности регистрации.
+        Tuple[Optional[str], bool]: Полное имя пользователя (None, если ещё не
+            указано) и флаг завершенности регистрации.
     """
     session = Session()
     try:
-        user = session.query(User).filter_by(telegram_id=telegram_id).first()
+        user = session.execute(
+            _USER_SUMMARY_BY_TELEGRAM_ID, {"telegram_id": telegram_id}
+        ).first()
         if user:
             is_complete = all([user.full_name, user.phone, user.email])
             logger.debug(
-                f"Пользователь {telegram_id} уже существует, завершенность регистрации: {is_complete}, referrer_id: {user.referrer_id}"
+                f"Пользователь {telegram_id} уже существует, завершенность регистрации: {is_complete}"
             )
-            return user, is_complete
+            return user.full_name, is_complete
         else:
             user = User(
                 telegram_id=telegram_id,
                 username=username,
-                first_join_time=datetime.now(MOSCOW_TZ),
                 referrer_id=referrer_id,
                 invited_count=0,
             )
@@ -358,7 +589,7 @@ def check_and_add_user(
             logger.info(
                 f"Создан новый пользователь {telegram_id} с referrer_id {referrer_id}"
             )
-            return user, False
+            return None, False
     except Exception as e:
         logger.error(f"Ошибка при проверке/добавлении пользователя {telegram_id}: {e}")
         session.rollback()
@@ -394,7 +625,7 @@ def add_user(
     """
     session = Session()
     try:
-        user = session.query(User).filter_by(telegram_id=telegram_id).first()
+        user = _find_user(session, telegram_id)
         if user:
             logger.info(f"Обновление пользователя {telegram_id}")
             if full_name is not None:
@@ -423,7 +654,6 @@ def add_user(
             logger.info(f"Создание нового пользователя {telegram_id}")
             user = User(
                 telegram_id=telegram_id,
-                first_join_time=datetime.now(MOSCOW_TZ),
                 full_name=full_name,
                 phone=phone,
                 email=email,
@@ -439,13 +669,10 @@ def add_user(
                 referrer_id=referrer_id,
             )
             session.add(user)
-            session.flush()
 
         # Если регистрация завершена и есть referrer_id, увеличиваем invited_count реферера
         if full_name and phone and email and user.referrer_id:
-            referrer = (
-                session.query(User).filter_by(telegram_id=user.referrer_id).first()
-            )
+            referrer = _find_user(session, user.referrer_id)
             if referrer:
                 referrer.invited_count += 1
                 session.add(referrer)
@@ -459,19 +686,21 @@ def add_user(
                 )
 
         if full_name and phone and email:
+            # Связь вместо user_id: пользователь и уведомление пишутся одним flush
             notification = Notification(
-                user_id=user.id,
+                user=user,
                 message=f"Новый пользователь: {full_name}",
-                created_at=datetime.now(MOSCOW_TZ),
                 is_read=False,
             )
             session.add(notification)
+        session.commit()
+        if full_name and phone and email:
             logger.info(
-                f"Уведомление создано для пользователя {user.id}: {notification.message}"
+                f"Уведомление создано для пользователя {telegram_id}: {notification.message}"
             )
-        session.commit()
     except Exception as e:
         session.rollback()
+        _user_pk_cache.pop(telegram_id, None)
         logger.error(
             f"Ошибка добавления/обновления пользователя {telegram_id}: {str(e)}"
         )
@@ -480,11 +709,39 @@ def add_user(
         session.close()
 
 
-def get_active_tariffs() -> List[Tariff]:
-    """Возвращает список активных тарифов из базы данных."""
+# Кэш живёт в процессе бота, а тарифы меняются из веб-панели (другой процесс),
+# поэтому изменения становятся видны боту не позже чем через ACTIVE_TARIFFS_TTL.
+ACTIVE_TARIFFS_TTL = 60  # секунды
+_active_tariffs_cache: Optional[Tuple[float, List[Row]]] = None
+
+
+def get_active_tariffs() -> List[Row]:
+    """
+    Возвращает список активных тарифов из базы данных.
+
+    Тарифы возвращаются лёгкими строками (id, name, description, price, purpose,
+    service_id) без ORM-гидратации и кэшируются на ACTIVE_TARIFFS_TTL секунд.
+    """
+    global _active_tariffs_cache
+    if (
+        _active_tariffs_cache is not None
+        and time.monotonic() - _active_tariffs_cache[0] < ACTIVE_TARIFFS_TTL
+    ):
+        return _active_tariffs_cache[1]
+
     session = Session()
     try:
-        tariffs = session.query(Tariff).filter_by(is_active=True).all()
+        tariffs = session.execute(
+            select(
+                Tariff.id,
+                Tariff.name,
+                Tariff.description,
+                Tariff.price,
+                Tariff.purpose,
+                Tariff.service_id,
+            ).where(Tariff.is_active.is_(True))
+        ).all()
+        _active_tariffs_cache = (time.monotonic(), tariffs)
         logger.info(f"Получено {len(tariffs)} активных тарифов")
         return tariffs
     except Exception as e:
@@ -592,17 +849,22 @@ def create_booking(
     session = Session()
     retries = 3
     try:
-        user = session.query(User).filter_by(telegram_id=telegram_id).first()
-        if not user:
-            logger.warning(f"Пользователь с telegram_id {telegram_id} не найден")
+        # Пользователь и тариф загружаются одним запросом
+        row = session.execute(
+            _USER_AND_ACTIVE_TARIFF,
+            {"telegram_id": telegram_id, "tariff_id": tariff_id},
+        ).first()
+        if row is None:
+            user_exists = session.execute(
+                _USER_ID_BY_TELEGRAM_ID, {"telegram_id": telegram_id}
+            ).scalar()
             session.close()
-            return None, "Пользователь не найден", None
-
-        tariff = session.query(Tariff).filter_by(id=tariff_id, is_active=True).first()
-        if not tariff:
+            if not user_exists:
+                logger.warning(f"Пользователь с telegram_id {telegram_id} не найден")
+                return None, "Пользователь не найден", None
             logger.warning(f"Тариф с ID {tariff_id} не найден или не активен")
-            session.close()
             return None, "Тариф не найден", None
+        user, tariff = row
 
         for attempt in range(retries):
             try:
@@ -618,9 +880,6 @@ def create_booking(
                     confirmed=confirmed,
                     payment_id=payment_id,
                 )
-                session.add(booking)
-                session.flush()
-
                 # Формируем данные для уведомления
                 booking_data = {
                     "tariff_name": tariff.name,
@@ -649,11 +908,11 @@ def create_booking(
                         if tariff.purpose == "Переговорная"
                         else ""
                     ),
-                    created_at=datetime.now(MOSCOW_TZ),
                     is_read=False,
-                    booking_id=booking.id,
+                    booking=booking,
                 )
-                session.add(notification)
+                # Бронь и уведомление записываются одним flush при commit
+                session.add_all([booking, notification])
                 session.commit()
 
                 admin_message = format_booking_notification(user, tariff, booking_data)
@@ -770,8 +1029,6 @@ def create_ticket(
                     description=description,
                     photo_id=photo_id,
                     status=status,
-                    created_at=datetime.now(MOSCOW_TZ),
-                    updated_at=datetime.now(MOSCOW_TZ),
                 )
                 session.add(ticket)
                 session.flush()
@@ -779,7 +1036,6 @@ def create_ticket(
                 notification = Notification(
                     user_id=user.id,
                     message=f"Новая заявка #{ticket.id} от {user.full_name or 'пользователя'}: {description[:50]}{'...' if len(description) > 50 else ''}",
-                    created_at=datetime.now(MOSCOW_TZ),
                     is_read=False,
                     ticket_id=ticket.id,
                 )
@@ -1,6 +1,7 @@
 import os
 from typing import Optional
 from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
 from dotenv import load_dotenv
 from utils.logger import get_logger
 
@@ -10,6 +11,8 @@ logger = get_logger(__name__)
 load_dotenv()
 
 BOT_TOKEN = os.getenv("BOT_TOKEN")
+# Максимум одновременных соединений с api.telegram.org в общем пуле
+BOT_CONNECTION_LIMIT = 50
 
 _bot: Optional[Bot] = None
 
@@ -30,7 +33,9 @@ def init_bot() -> Bot:
         if not bot_token:
             logger.error("BOT_TOKEN не указан в конфигурации")
             raise ValueError("BOT_TOKEN не указан")
-        _bot = Bot(token=bot_token)
+        # Одна HTTP-сессия с пулом соединений на весь процесс
+        session = AiohttpSession(limit=BOT_CONNECTION_LIMIT)
+        _bot = Bot(token=bot_token, session=session)
         logger.info("Экземпляр бота успешно инициализирован")
     return _bot
 
@@ -48,3 +53,8 @@ def get_bot() -> Bot:
     if _bot is None:
         return init_bot()
     return _bot
+
+
+# Инициализируем бота при импорте, если токен задан
+if BOT_TOKEN:
+    init_bot()
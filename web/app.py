@@ -1,28 +1,125 @@
-from typing import Optional
-from flask import Flask
+from typing import Any, Dict, Optional, Tuple
+from flask import Flask, Response, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from jinja2 import FileSystemBytecodeCache
 import logging
 import os
+from sqlalchemy import event, text
 from sqlalchemy.exc import OperationalError
 from dotenv import load_dotenv
+import orjson
 import time
-import pytz
 
+from models.models import Admin, ADMIN_BY_LOGIN, init_db
 from utils.logger import get_logger
 
 # Тихая настройка логгера для модуля
 logger = get_logger(__name__)
 
+# Отключаем стандартное логирование Flask (один раз при импорте)
+logging.getLogger("werkzeug").handlers.clear()
+logging.getLogger("werkzeug").setLevel(logging.CRITICAL)
+
+load_dotenv()  # Загружаем переменные из .env один раз при импорте
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:////data/coworking.db")
+SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
+ADMIN_LOGIN = os.getenv("ADMIN_LOGIN", "admin")
+ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin123")
+
 db = SQLAlchemy()
 login_manager = LoginManager()
 
+# Администраторы, загруженные user_loader, по ID (отсоединены от сессии)
+ADMIN_CACHE_TTL = 300  # секунды
+_admin_cache: Dict[int, Tuple[float, Admin]] = {}
+
 # Конфигурационные константы
 UPLOAD_FOLDER = "uploads/newsletter"
 AVATAR_FOLDER = "/app/static/avatars"
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 МБ
 MAX_AVATAR_SIZE = 5 * 1024 * 1024  # 5 МБ для аватаров
-MOSCOW_TZ = pytz.timezone("Europe/Moscow")
+JINJA_CACHE_DIR = os.getenv("JINJA_CACHE_DIR", "/tmp/jinja_cache")
+# Порог числа SQL-запросов на один HTTP-запрос в режиме отладки (признак N+1)
+REQUEST_QUERY_WARN_LIMIT = 10
+
+# Параметры пула соединений для файловой SQLite под Gunicorn (воркеры с потоками)
+SQLITE_ENGINE_OPTIONS = {
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_timeout": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+    # Кэш скомпилированных SQL-выражений (по умолчанию 500 записей)
+    "query_cache_size": 1200,
+    "connect_args": {"check_same_thread": False},
+}
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON-провайдер Flask на orjson: используется jsonify и фильтром tojson.
+
+    Ключи не сортируются. Даты, Decimal и прочие типы, которые orjson не
+    сериализует сам, передаются в стандартный обработчик Flask, поэтому формат
+    ответа для них не меняется.
+    """
+
+    _options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self._options).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Настраивает каждое новое соединение SQLite: WAL, ожидание блокировок и кэш.
+
+    Args:
+        dbapi_connection: Исходное соединение sqlite3.
+        connection_record: Запись пула соединений SQLAlchemy.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+def _enable_query_counter(app: Flask) -> None:
+    """
+    Считает SQL-запросы каждого HTTP-запроса и предупреждает о превышении порога.
+
+    Включается только в режиме отладки: вместе с raiseload из
+    strict_loading_options помогает заметить N+1 до выкладки.
+
+    Args:
+        app: Экземпляр Flask приложения (вызывается внутри app_context).
+    """
+
+    @event.listens_for(db.engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            g.query_count = g.get("query_count", 0) + 1
+
+    @app.after_request
+    def _log_query_count(response: Response) -> Response:
+        count = g.get("query_count", 0)
+        if count > REQUEST_QUERY_WARN_LIMIT:
+            logger.warning(
+                "%s %s: %s SQL-запросов за запрос", request.method, request.path, count
+            )
+        else:
+            logger.debug("%s %s: %s SQL-запросов", request.method, request.path, count)
+        return response
 
 
 def create_app() -> Flask:
@@ -32,73 +129,62 @@ def create_app() -> Flask:
     Returns:
         Flask: Настроенное приложение Flask.
     """
-    load_dotenv()  # Загружаем переменные из .env
-
     app = Flask(__name__, template_folder="templates", static_folder="static")
-    app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv(
-        "DATABASE_URL", "sqlite:////data/coworking.db"
-    )
-    app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "default-secret-key")
+    app.json = OrjsonProvider(app)
+    app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL
+    app.config["SECRET_KEY"] = SECRET_KEY
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
     app.config["AVATAR_FOLDER"] = AVATAR_FOLDER
     app.config["MAX_CONTENT_LENGTH"] = MAX_FILE_SIZE
+    app.config["TEMPLATES_AUTO_RELOAD"] = False
+
+    # Скомпилированные шаблоны сохраняются на диск и переиспользуются воркерами
+    # и после перезапуска; без автоперезагрузки не проверяется mtime шаблонов
+    os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
+    app.jinja_env.auto_reload = False
 
-    # Отключаем стандартное логирование Flask
-    logging.getLogger("werkzeug").handlers.clear()
-    logging.getLogger("werkzeug").setLevel(logging.CRITICAL)
+    database_uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    is_sqlite_file = (
+        database_uri.startswith("sqlite:") and ":memory:" not in database_uri
+    )
+    if is_sqlite_file:
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = SQLITE_ENGINE_OPTIONS
 
     db.init_app(app)
     login_manager.init_app(app)
     login_manager.login_view = "login"
 
     with app.app_context():
-        from models.models import Admin
+        if is_sqlite_file:
+            event.listen(db.engine, "connect", _set_sqlite_pragmas)
+        if app.debug:
+            _enable_query_counter(app)
 
         # Проверяем, что переменные окружения заданы
-        admin_login = os.getenv("ADMIN_LOGIN", "admin")
-        admin_password = os.getenv("ADMIN_PASSWORD", "admin123")
+        admin_login = ADMIN_LOGIN
+        admin_password = ADMIN_PASSWORD
 
         if not admin_login or not admin_password:
             logger.error("ADMIN_LOGIN или ADMIN_PASSWORD не заданы в .env")
             raise ValueError("ADMIN_LOGIN и ADMIN_PASSWORD должны быть заданы в .env")
 
-        # Проверяем наличие администратора с повторными попытками
-        max_retries = 10
-        retry_delay = 1  # секунды
-        for attempt in range(max_retries):
-            try:
-                admin = db.session.query(Admin).filter_by(login=admin_login).first()
-                if not admin:
-                    logger.warning(
-                        f"Администратор с логином {admin_login} не найден в базе данных на попытке {attempt + 1}/{max_retries}"
-                    )
-                    if attempt == max_retries - 1:
-                        logger.error(
-                            f"Администратор с логином {admin_login} не создан ботом после {max_retries} попыток"
-                        )
-                        raise ValueError(
-                            f"Администратор с логином {admin_login} должен быть создан ботом"
-                        )
-                    time.sleep(retry_delay)
-                    continue
-                break  # Успешно, выходим из цикла
-            except OperationalError as e:
-                if "no such table" in str(e):
-                    logger.warning(
-                        f"Таблицы еще не созданы, попытка {attempt + 1}/{max_retries}. Ждем {retry_delay} сек."
-                    )
-                    time.sleep(retry_delay)
-                    continue
-                else:
-                    logger.error(f"Ошибка базы данных при инициализации: {e}")
-                    raise
-            except Exception as e:
-                logger.error(f"Неожиданная ошибка при инициализации: {e}")
-                raise
-
-        # Создание таблиц
-        db.create_all()
+        # Бот создаёт таблицы и администратора до старта веба (depends_on:
+        # service_healthy), поэтому достаточно одной проверки. Ожидание снятия
+        # блокировок выполняет сама SQLite через PRAGMA busy_timeout.
+        try:
+            admin = db.session.scalar(ADMIN_BY_LOGIN, {"login": admin_login})
+        except OperationalError as e:
+            logger.error(f"Ошибка базы данных при инициализации: {e}")
+            raise
+        if not admin:
+            logger.error(
+                f"Администратор с логином {admin_login} не найден в базе данных"
+            )
+            raise ValueError(
+                f"Администратор с логином {admin_login} должен быть создан ботом"
+            )
 
         # Инициализация маршрутов
         from web.routes import (
@@ -123,11 +209,44 @@ def create_app() -> Flask:
         init_dashboard_routes(app)
         init_ticket_routes(app)
 
+    @app.route("/health")
+    def health() -> Tuple[Dict[str, str], int]:
+        """Проверка доступности приложения и базы данных (SELECT 1)."""
+        try:
+            db.session.execute(text("SELECT 1"))
+            return {"status": "ok"}, 200
+        except Exception as e:
+            logger.error(f"Healthcheck: база данных недоступна: {e}")
+            return {"status": "error"}, 503
+
+    @app.cli.command("db-init")
+    def db_init_command() -> None:
+        """Создаёт таблицы и администратора (разовая команда: flask db-init)."""
+        init_db(ADMIN_LOGIN, ADMIN_PASSWORD)
+        logger.info("База данных инициализирована командой db-init")
+
     return app
 
 
+def invalidate_admin_cache(admin_id: Optional[int] = None) -> None:
+    """
+    Сбрасывает кэш администраторов для user_loader.
+
+    Вызывается после изменения записи администратора в веб-панели. Кэш есть у
+    каждого воркера свой, поэтому изменения из других процессов (бот,
+    flask db-init) видны не позже чем через ADMIN_CACHE_TTL.
+
+    Args:
+        admin_id: ID администратора; если не указан, кэш очищается полностью.
+    """
+    if admin_id is None:
+        _admin_cache.clear()
+    else:
+        _admin_cache.pop(admin_id, None)
+
+
 @login_manager.user_loader
-def load_user(user_id: str) -> Optional["Admin"]:
+def load_user(user_id: str) -> Optional[Admin]:
     """
     Загружает администратора по его ID для Flask-Login.
 
@@ -137,9 +256,19 @@ def load_user(user_id: str) -> Optional["Admin"]:
     Returns:
         Admin or None: Объект администратора или None, если не найден.
     """
-    from models.models import Admin
+    admin_id = int(user_id)
+    cached = _admin_cache.get(admin_id)
+    if cached is not None and time.monotonic() - cached[0] < ADMIN_CACHE_TTL:
+        return cached[1]
 
-    return db.session.get(Admin, int(user_id))
+    admin = db.session.get(Admin, admin_id)
+    if admin is None:
+        _admin_cache.pop(admin_id, None)
+        return None
+    # Отсоединяем объект, чтобы commit в запросах не делал его устаревшим
+    db.session.expunge(admin)
+    _admin_cache[admin_id] = (time.monotonic(), admin)
+    return admin
 
 
 app = create_app()
@@ -1,18 +1,111 @@
-from typing import Any
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
 
-from flask import Flask, request, render_template, redirect, url_for, flash
+from flask import Flask, request, render_template, redirect, url_for, flash, session
 from flask_login import login_user, logout_user, login_required
-from werkzeug.security import check_password_hash
+from werkzeug.security import check_password_hash, generate_password_hash
 
-from models.models import Admin
+from models.models import Admin, ADMIN_BY_LOGIN, ADMIN_PASSWORD_HASH_METHOD
 
-from web.app import db
+from web.app import db, invalidate_admin_cache
 
 from utils.logger import get_logger
 
 # Тихая настройка логгера для модуля
 logger = get_logger(__name__)
 
+# Ограничение неудачных попыток входа в скользящем окне по паре (IP, логин) и
+# по IP в целом (перебор разных логинов): после превышения лимита pbkdf2 не
+# запускается вовсе
+LOGIN_FAIL_LIMIT = 10
+LOGIN_FAIL_IP_LIMIT = 30
+LOGIN_FAIL_WINDOW = 60  # секунды
+LOGIN_FAIL_MAX_KEYS = 10000
+_login_failures: Dict[Tuple[str, ...], Deque[float]] = {}
+
+# Хэш для проверки пароля при несуществующем логине: время ответа не должно
+# выдавать, есть ли такой администратор
+_DUMMY_PASSWORD_HASH = generate_password_hash(
+    "dummy-password", method=ADMIN_PASSWORD_HASH_METHOD
+)
+
+# Отрендеренная страница входа без flash-сообщений: для GET она всегда одинакова
+_login_page_html: Optional[str] = None
+
+
+def _count_recent_failures(key: Tuple[str, ...]) -> int:
+    """
+    Возвращает число неудачных попыток для ключа внутри окна.
+
+    Args:
+        key: Пара (IP-адрес, логин) или (IP-адрес,) для счётчика по IP.
+
+    Returns:
+        Количество неудачных попыток за последние LOGIN_FAIL_WINDOW секунд.
+    """
+    failures = _login_failures.get(key)
+    if not failures:
+        return 0
+    now = time.monotonic()
+    while failures and now - failures[0] > LOGIN_FAIL_WINDOW:
+        failures.popleft()
+    if not failures:
+        _login_failures.pop(key, None)
+        return 0
+    return len(failures)
+
+
+def _evict_login_failures() -> None:
+    """
+    Освобождает место в таблице неудачных попыток при достижении лимита ключей.
+
+    Сначала удаляются ключи, у которых все попытки вышли за окно; если таблица
+    всё ещё заполнена, удаляется самый старый ключ. Активные блокировки не
+    сбрасываются массово, поэтому лимит нельзя обойти наплывом новых ключей.
+    """
+    now = time.monotonic()
+    for key, failures in list(_login_failures.items()):
+        if not failures or now - failures[-1] > LOGIN_FAIL_WINDOW:
+            _login_failures.pop(key, None)
+    if len(_login_failures) >= LOGIN_FAIL_MAX_KEYS:
+        oldest = next(iter(list(_login_failures)), None)
+        if oldest is not None:
+            _login_failures.pop(oldest, None)
+
+
+def _register_failure(key: Tuple[str, ...]) -> None:
+    """Запоминает неудачную попытку входа для ключа (IP-адрес, логин) или (IP,)."""
+    if len(_login_failures) >= LOGIN_FAIL_MAX_KEYS:
+        _evict_login_failures()
+    _login_failures.setdefault(key, deque()).append(time.monotonic())
+
+
+def _upgrade_password_hash(admin: Admin, password: str) -> None:
+    """
+    Пересчитывает хэш пароля, созданный с другими параметрами pbkdf2.
+
+    Вызывается после успешной проверки пароля: хэши, созданные до перехода на
+    ADMIN_PASSWORD_HASH_METHOD (например, с 600 000 итераций Werkzeug), заменяются,
+    и следующие входы проверяются быстрее. Ошибка сохранения не мешает входу.
+
+    Args:
+        admin: Администратор, прошедший проверку пароля.
+        password: Введённый пароль.
+    """
+    if admin.password.startswith(f"{ADMIN_PASSWORD_HASH_METHOD}$"):
+        return
+    try:
+        admin.password = generate_password_hash(
+            password, method=ADMIN_PASSWORD_HASH_METHOD
+        )
+        db.session.commit()
+        invalidate_admin_cache(admin.id)
+        logger.info(f"Хэш пароля администратора {admin.login} пересчитан")
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Не удалось пересчитать хэш пароля администратора: {str(e)}")
+
 
 def init_auth_routes(app: Flask) -> None:
     """Инициализация маршрутов для аутентификации."""
@@ -25,19 +118,45 @@ def init_auth_routes(app: Flask) -> None:
         Returns:
             Рендеринг страницы логина или редирект на дашборд.
         """
+        global _login_page_html
         if request.method == "POST":
             login_name = request.form.get("login", "").strip()
             password = request.form.get("password", "")
-            user = db.session.query(Admin).filter_by(login=login_name).first()
-            if user and check_password_hash(user.password, password):
+            ip_key = (request.remote_addr or "",)
+            key = (*ip_key, login_name)
+            if (
+                _count_recent_failures(key) >= LOGIN_FAIL_LIMIT
+                or _count_recent_failures(ip_key) >= LOGIN_FAIL_IP_LIMIT
+            ):
+                logger.warning(
+                    f"Превышен лимит попыток входа: логин={login_name}, IP={key[0]}"
+                )
+                flash("Слишком много попыток входа. Попробуйте позже", "error")
+                return render_template("login.html"), 429
+
+            user = db.session.scalar(ADMIN_BY_LOGIN, {"login": login_name})
+            password_hash = user.password if user else _DUMMY_PASSWORD_HASH
+            password_ok = check_password_hash(password_hash, password)
+            if user and password_ok:
+                _login_failures.pop(key, None)
+                _upgrade_password_hash(user, password)
                 login_user(user)
                 next_page = request.args.get("next")
                 logger.info(f"Успешный вход администратора: {login_name}")
                 return redirect(next_page or url_for("dashboard"))
             else:
+                _register_failure(key)
+                _register_failure(ip_key)
                 logger.error(f"Неудачная попытка входа: логин={login_name}")
                 flash("Неверный логин или пароль", "error")
-        return render_template("login.html")
+            return render_template("login.html")
+
+        # Страница с flash-сообщениями рендерится заново, остальные GET — из кэша
+        if session.get("_flashes"):
+            return render_template("login.html")
+        if _login_page_html is None:
+            _login_page_html = render_template("login.html")
+        return _login_page_html
 
     @app.route("/logout")
     @login_required
@@ -1,23 +1,41 @@
 from flask import Flask, request, render_template, redirect, url_for, flash
 from flask_login import login_required
-from datetime import datetime, date
+from datetime import date, datetime, time
+from sqlalchemy import tuple_
+from sqlalchemy.orm import contains_eager, joinedload
 from typing import Any, Optional
 
 from models.models import Booking, User, Tariff, Promocode
 from web.routes.utils import (
-    get_unread_notifications_count,
-    get_recent_notifications,
-    send_telegram_message_sync,
+    send_telegram_message_background,
+    strict_loading_options,
 )
 from web.app import db
-import pytz
+from zoneinfo import ZoneInfo
 
 from utils.logger import get_logger
 
 # Тихая настройка логгера для модуля
 logger = get_logger(__name__)
 
-MOSCOW_TZ = pytz.timezone("Europe/Moscow")
+MOSCOW_TZ = ZoneInfo("Europe/Moscow")
+
+BOOKINGS_PER_PAGE = 50
+
+
+def _booking_detail_options() -> list:
+    """
+    Опции загрузки брони для карточки: пользователь, тариф и промокод одним JOIN.
+
+    Returns:
+        Список опций загрузчика для Session.get().
+    """
+    return [
+        joinedload(Booking.user),
+        joinedload(Booking.tariff),
+        joinedload(Booking.promocode),
+        *strict_loading_options(),
+    ]
 
 
 def format_booking_confirmation_notification(
@@ -73,7 +91,7 @@ def format_booking_confirmation_notification(
 ⏰ <i>Время подтверждения: {datetime.now(MOSCOW_TZ).strftime('%d.%m.%Y %H:%M:%S')}</i>"""
 
     logger.debug(
-        f"Сформировано сообщение о подтверждении брони {booking.id}:\n{message}"
+        "Сформировано сообщение о подтверждении брони %s:\n%s", booking.id, message
     )
     return message.strip()
 
@@ -87,45 +105,82 @@ def init_booking_routes(app: Flask) -> None:
         """
         Отображение списка бронирований с возможностью поиска по имени пользователя и дате визита.
 
+        Args:
+            after_visit_date (optional): Дата визита последней брони предыдущей
+                страницы (YYYY-MM-DD).
+            after_id (optional): ID последней брони предыдущей страницы.
+
         Returns:
             Рендеринг шаблона bookings.html с отфильтрованными данными бронирований.
         """
         user_query = request.args.get("user_query", "").strip()
         date_query = request.args.get("date_query", "").strip()
+        after_id = request.args.get("after_id", type=int)
+        after_visit_date = request.args.get("after_visit_date", type=date.fromisoformat)
 
         # Базовый запрос для получения бронирований
+        # Связи user и tariff заполняются из тех же JOIN, что и фильтр,
+        # вместо дополнительных JOIN от lazy="joined"
         query = (
             db.session.query(Booking)
-            .join(User)
-            .join(Tariff)
-            .order_by(Booking.visit_date.desc())
+            .join(Booking.user)
+            .join(Booking.tariff)
+            .options(
+                contains_eager(Booking.user),
+                contains_eager(Booking.tariff),
+                *strict_loading_options(),
+            )
+            .order_by(Booking.visit_date.desc(), Booking.id.desc())
         )
 
         # Фильтрация по имени пользователя (регистронезависимый частичный поиск)
         if user_query:
             query = query.filter(User.full_name.ilike(f"%{user_query}%"))
-            logger.debug(f"Применён фильтр по имени пользователя: {user_query}")
+            logger.debug("Применён фильтр по имени пользователя: %s", user_query)
 
         # Фильтрация по дате визита (точное совпадение)
         if date_query:
             try:
-                query_date = datetime.strptime(date_query, "%Y-%m-%d").date()
+                query_date = date.fromisoformat(date_query)
                 query = query.filter(Booking.visit_date == query_date)
-                logger.debug(f"Применён фильтр по дате визита: {date_query}")
+                logger.debug("Применён фильтр по дате визита: %s", date_query)
             except ValueError:
                 flash("Неверный формат даты. Используйте YYYY-MM-DD")
                 logger.warning(f"Неверный формат даты в запросе: {date_query}")
 
-        bookings = query.all()
-        logger.info(f"Найдено {len(bookings)} бронирований после фильтрации")
+        # Пагинация по курсору (visit_date, id): поиск по индексу без OFFSET
+        is_first_page = after_id is None or after_visit_date is None
+        if not is_first_page:
+            query = query.filter(
+                tuple_(Booking.visit_date, Booking.id)
+                < tuple_(after_visit_date, after_id)
+            )
+        bookings = query.limit(BOOKINGS_PER_PAGE + 1).all()
+
+        filter_args = {
+            key: value
+            for key, value in (("user_query", user_query), ("date_query", date_query))
+            if value
+        }
+        next_cursor = None
+        if len(bookings) > BOOKINGS_PER_PAGE:
+            bookings = bookings[:BOOKINGS_PER_PAGE]
+            last = bookings[-1]
+            next_cursor = {
+                **filter_args,
+                "after_visit_date": last.visit_date.isoformat(),
+                "after_id": last.id,
+            }
+        logger.info(
+            f"Найдено {len(bookings)} бронирований на странице после фильтрации"
+        )
 
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         return render_template(
             "bookings.html",
             bookings=bookings,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
+            next_cursor=next_cursor,
+            filter_args=filter_args,
+            is_first_page=is_first_page,
         )
 
     @app.route("/booking/<int:booking_id>")
@@ -140,15 +195,15 @@ def init_booking_routes(app: Flask) -> None:
         Returns:
             Рендеринг шаблона booking_detail.html или редирект.
         """
-        booking = db.session.get(Booking, booking_id)
+        booking = db.session.get(
+            Booking, booking_id, options=_booking_detail_options()
+        )
         if not booking:
             flash("Бронирование не найдено")
             logger.warning(f"Бронирование {booking_id} не найдено")
             return redirect(url_for("bookings"))
 
-        logger.debug(f"Promocode for booking {booking_id}: {booking.promocode}")
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
+        logger.debug("Promocode for booking %s: %s", booking_id, booking.promocode)
         return render_template(
             "booking_detail.html",
             booking=booking,
@@ -156,8 +211,6 @@ def init_booking_routes(app: Flask) -> None:
             tariff=booking.tariff,
             promocode=booking.promocode,
             edit=False,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/booking/<int:booking_id>/edit", methods=["GET", "POST"])
@@ -172,21 +225,23 @@ def init_booking_routes(app: Flask) -> None:
         Returns:
             Рендеринг шаблона booking_detail.html или редирект.
         """
-        booking = db.session.get(Booking, booking_id)
+        booking = db.session.get(
+            Booking, booking_id, options=_booking_detail_options()
+        )
         if not booking:
             flash("Бронирование не найдено")
             logger.warning(f"Бронирование {booking_id} не найдено")
             return redirect(url_for("bookings"))
 
-        logger.debug(f"Promocode for booking {booking_id}: {booking.promocode}")
+        logger.debug("Promocode for booking %s: %s", booking_id, booking.promocode)
 
         if request.method == "POST":
             try:
                 visit_date = request.form.get("visit_date")
-                booking.visit_date = datetime.strptime(visit_date, "%Y-%m-%d").date()
+                booking.visit_date = date.fromisoformat(visit_date)
                 if booking.tariff.purpose == "Переговорная":
                     visit_time = request.form.get("visit_time")
-                    booking.visit_time = datetime.strptime(visit_time, "%H:%M").time()
+                    booking.visit_time = time.fromisoformat(visit_time)
                     booking.duration = int(request.form.get("duration"))
                 booking.amount = float(request.form.get("amount"))
                 booking.paid = request.form.get("paid") == "on"
@@ -199,8 +254,6 @@ def init_booking_routes(app: Flask) -> None:
                 flash("Ошибка при обновлении данных")
                 logger.error(f"Ошибка обновления бронирования {booking_id}: {str(e)}")
 
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         return render_template(
             "booking_detail.html",
             booking=booking,
@@ -208,8 +261,6 @@ def init_booking_routes(app: Flask) -> None:
             tariff=booking.tariff,
             promocode=booking.promocode,
             edit=True,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/booking/<int:booking_id>/delete", methods=["POST"])
@@ -252,7 +303,9 @@ def init_booking_routes(app: Flask) -> None:
         Returns:
             Редирект на страницу бронирования.
         """
-        booking = db.session.get(Booking, booking_id)
+        booking = db.session.get(
+            Booking, booking_id, options=_booking_detail_options()
+        )
         if not booking:
             flash("Бронирование не найдено")
             logger.warning(f"Бронирование {booking_id} не найдено")
@@ -265,13 +318,10 @@ def init_booking_routes(app: Flask) -> None:
 
         try:
             booking.confirmed = True
-            user = db.session.get(User, booking.user_id)
-            tariff = db.session.get(Tariff, booking.tariff_id)
-            promocode = (
-                db.session.get(Promocode, booking.promocode_id)
-                if booking.promocode_id
-                else None
-            )
+            # Пользователь, тариф и промокод загружены вместе с бронью
+            user = booking.user
+            tariff = booking.tariff
+            promocode = booking.promocode
 
             if not user or not tariff:
                 flash("Ошибка: пользователь или тариф не найдены")
@@ -283,17 +333,11 @@ def init_booking_routes(app: Flask) -> None:
             message = format_booking_confirmation_notification(
                 user, booking, tariff, promocode
             )
-            success = send_telegram_message_sync(user.telegram_id, message)
-            if success:
-                logger.info(
-                    f"Сообщение о подтверждении брони {booking_id} отправлено пользователю {user.telegram_id}"
-                )
-            else:
-                logger.error(
-                    f"Не удалось отправить сообщение пользователю {user.telegram_id} для брони {booking_id}"
-                )
-
+            telegram_id = user.telegram_id
             db.session.commit()
+
+            # Ответ не ждёт Telegram: результат отправки пишется в лог
+            send_telegram_message_background(telegram_id, message)
             flash("Бронирование подтверждено")
             logger.info(f"Бронирование {booking_id} подтверждено")
         except Exception as e:
@@ -1,20 +1,124 @@
+import threading
 import time
 import uuid
-from datetime import datetime, timedelta
 from sqlite3 import OperationalError
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
-from flask import Flask, render_template, jsonify, flash, request
+from flask import Flask, Response, render_template, jsonify, flash, request
 from flask_login import login_required
+from sqlalchemy import delete, func, select, update
 
-from models.models import Notification, Session
+from models.models import Notification, Session, moscow_now_sql
 from utils.logger import get_logger
-from web.app import db, MOSCOW_TZ
-from web.routes.utils import get_unread_notifications_count, get_recent_notifications
+from web.app import db
+from web.routes.utils import (
+    format_notification_time,
+    get_unread_notifications_count,
+    get_notification_summary,
+    invalidate_notifications_cache,
+)
 
 # Тихая настройка логгера для модуля
 logger = get_logger(__name__)
 
+# Готовые JSON-ответы /get_notifications по ключу (since_id, page): вкладки
+# админов опрашивают эндпоинт постоянно, а данные меняются редко
+NOTIFICATIONS_PAYLOAD_TTL = 5  # секунды
+NOTIFICATIONS_PAYLOAD_MAX_KEYS = 256
+_notifications_payload_cache: Dict[Tuple[Optional[int], int], Tuple[float, bytes]] = {}
+
+
+def _invalidate_notification_caches(unread_count: Optional[int] = None) -> None:
+    """
+    Сбрасывает кэши счётчика и ответов /get_notifications после изменений.
+
+    Args:
+        unread_count: Известное число непрочитанных после изменения, если есть.
+    """
+    invalidate_notifications_cache(unread_count)
+    _notifications_payload_cache.clear()
+
+
+def _conditional_json_response(body: bytes) -> Response:
+    """
+    Отдаёт JSON с ETag: при совпадении If-None-Match возвращается 304 без тела.
+
+    Args:
+        body: Сериализованный JSON-ответ.
+
+    Returns:
+        Ответ 200 с телом или 304 Not Modified.
+    """
+    response = Response(body, mimetype="application/json")
+    response.add_etag()
+    response.headers["Cache-Control"] = "private, max-age=0, must-revalidate"
+    return response.make_conditional(request)
+
+
+# Очистка старых уведомлений выполняется в фоне короткими транзакциями;
+# блокировка не даёт запустить две очистки одновременно в одном воркере
+CLEANUP_BATCH_SIZE = 1000
+NOTIFICATION_RETENTION_DAYS = 30
+
+# Колонки для списков уведомлений: строки Row вместо ORM-объектов
+NOTIFICATION_LIST_COLUMNS = (
+    Notification.id,
+    Notification.message,
+    Notification.created_at,
+    Notification.is_read,
+    Notification.user_id,
+    Notification.booking_id,
+    Notification.ticket_id,
+)
+_cleanup_lock = threading.Lock()
+
+
+def _clean_old_notifications_task() -> None:
+    """
+    Удаляет прочитанные уведомления старше NOTIFICATION_RETENTION_DAYS дней
+    пачками по CLEANUP_BATCH_SIZE.
+
+    Вызывается в фоновом потоке при захваченной _cleanup_lock и освобождает её.
+
+    Notes:
+        _cleanup_lock действует только внутри одного воркера Gunicorn: другие
+        воркеры могут запустить очистку параллельно. Это безопасно — пачки
+        удаляются по условию, и повторное удаление уже удалённых строк ничего
+        не делает. Сброс кэшей в конце затрагивает только текущий воркер,
+        остальные обновятся по истечении своих TTL.
+    """
+    session = Session()
+    total = 0
+    try:
+        # Граница считается самой SQLite в том же наивном московском времени,
+        # в котором хранится created_at, поэтому условие идёт по индексу как есть
+        threshold = func.datetime(
+            moscow_now_sql(), f"-{NOTIFICATION_RETENTION_DAYS} days"
+        )
+        old_ids = (
+            select(Notification.id)
+            .where(Notification.is_read == True, Notification.created_at < threshold)
+            .limit(CLEANUP_BATCH_SIZE)
+        )
+        while True:
+            deleted = session.execute(
+                delete(Notification)
+                .where(Notification.id.in_(old_ids))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            session.commit()
+            total += deleted
+            if deleted < CLEANUP_BATCH_SIZE:
+                break
+        logger.info(f"Удалено {total} старых прочитанных уведомлений")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Ошибка при очистке уведомлений: {str(e)}")
+    finally:
+        session.close()
+        _invalidate_notification_caches()
+        _cleanup_lock.release()
+
 
 def init_notification_routes(app: Flask) -> None:
     """
@@ -46,7 +150,7 @@ def init_notification_routes(app: Flask) -> None:
             page = request.args.get("page", 1, type=int)
             per_page = 15
             pagination = (
-                db.session.query(Notification)
+                db.session.query(*NOTIFICATION_LIST_COLUMNS)
                 .order_by(Notification.created_at.desc())
                 .paginate(page=page, per_page=per_page, error_out=False)
             )
@@ -78,17 +182,15 @@ def init_notification_routes(app: Flask) -> None:
                             else f"/user/{n.user_id}" if n.user_id else "#"
                         )
                     ),
-                    "created_at": (
-                        n.created_at.strftime("%Y-%m-%d %H:%M")
-                        if n.created_at
-                        else "Неизвестно"
-                    ),
+                    "created_at": format_notification_time(n.created_at),
                 }
                 for n in notifications
             ]
 
-            logger.info(
-                f"Загрузка страницы уведомлений: {len(notifications)} уведомлений, страница {page}"
+            logger.debug(
+                "Загрузка страницы уведомлений: %s уведомлений, страница %s",
+                len(notifications),
+                page,
             )
             return render_template(
                 "notifications.html",
@@ -126,15 +228,23 @@ def init_notification_routes(app: Flask) -> None:
         """
         try:
             request_id = str(uuid.uuid4())
-            logger.debug(f"Запрос на получение уведомлений, ID: {request_id}")
+            logger.debug("Запрос на получение уведомлений, ID: %s", request_id)
             since_id = request.args.get("since_id", type=int)
             page = request.args.get("page", 1, type=int)
             per_page = 15
 
+            cache_key = (since_id, page)
+            cached = _notifications_payload_cache.get(cache_key)
+            if (
+                cached is not None
+                and time.monotonic() - cached[0] < NOTIFICATIONS_PAYLOAD_TTL
+            ):
+                return _conditional_json_response(cached[1])
+
             unread_count = get_unread_notifications_count()
             if since_id:
                 recent_notifications = (
-                    db.session.query(Notification)
+                    db.session.query(*NOTIFICATION_LIST_COLUMNS)
                     .filter(Notification.id > since_id)
                     .order_by(Notification.created_at.desc())
                     .limit(per_page)
@@ -142,7 +252,7 @@ def init_notification_routes(app: Flask) -> None:
                 )
             else:
                 pagination = (
-                    db.session.query(Notification)
+                    db.session.query(*NOTIFICATION_LIST_COLUMNS)
                     .order_by(Notification.created_at.desc())
                     .paginate(page=page, per_page=per_page, error_out=False)
                 )
@@ -180,10 +290,8 @@ def init_notification_routes(app: Flask) -> None:
                                 )
                             )
                         ),
-                        "created_at": (
-                            notification.created_at.strftime("%Y-%m-%d %H:%M")
-                            if notification.created_at
-                            else "Неизвестно"
+                        "created_at": format_notification_time(
+                            notification.created_at
                         ),
                     }
                     formatted_notifications.append(formatted_notification)
@@ -213,9 +321,17 @@ def init_notification_routes(app: Flask) -> None:
             }
 
             logger.debug(
-                f"Отправляем данные (ID: {request_id}): unread_count={response_data['unread_count']}, notifications_count={len(formatted_notifications)}, page={page}"
+                "Отправляем данные (ID: %s): unread_count=%s, notifications_count=%s, page=%s",
+                request_id,
+                response_data["unread_count"],
+                len(formatted_notifications),
+                page,
             )
-            return jsonify(response_data)
+            body = jsonify(response_data).get_data()
+            if len(_notifications_payload_cache) >= NOTIFICATIONS_PAYLOAD_MAX_KEYS:
+                _notifications_payload_cache.clear()
+            _notifications_payload_cache[cache_key] = (time.monotonic(), body)
+            return _conditional_json_response(body)
 
         except Exception as e:
             logger.error(f"Ошибка получения уведомлений (ID: {request_id}): {str(e)}")
@@ -254,23 +370,38 @@ def init_notification_routes(app: Flask) -> None:
             Асимптотическая сложность: O(1).
         """
         try:
-            logger.debug(f"Помечаем уведомление {notification_id} как прочитанное")
-            notification = db.session.get(Notification, notification_id)
-            if not notification:
-                logger.warning(f"Уведомление {notification_id} не найдено")
-                return (
-                    jsonify({"status": "error", "message": "Уведомление не найдено"}),
-                    404,
+            logger.debug("Помечаем уведомление %s как прочитанное", notification_id)
+            # Одно UPDATE без загрузки объекта; отдельный SELECT нужен только
+            # в редком случае, когда ничего не обновилось
+            updated = db.session.execute(
+                update(Notification)
+                .where(
+                    Notification.id == notification_id,
+                    Notification.is_read == False,
                 )
+                .values(is_read=True),
+                execution_options={"synchronize_session": False},
+            ).rowcount
+            db.session.commit()
 
-            if notification.is_read:
+            if not updated:
+                exists = db.session.scalar(
+                    select(Notification.id).where(Notification.id == notification_id)
+                )
+                if exists is None:
+                    logger.warning(f"Уведомление {notification_id} не найдено")
+                    return (
+                        jsonify(
+                            {"status": "error", "message": "Уведомление не найдено"}
+                        ),
+                        404,
+                    )
                 logger.info(f"Уведомление {notification_id} уже прочитано")
                 return jsonify(
                     {"status": "success", "message": "Уведомление уже было прочитано"}
                 )
 
-            notification.is_read = True
-            db.session.commit()
+            _invalidate_notification_caches()
 
             logger.info(f"Уведомление {notification_id} помечено как прочитанное")
             return jsonify(
@@ -299,12 +430,15 @@ def init_notification_routes(app: Flask) -> None:
         """
         try:
             logger.debug("Помечаем все уведомления как прочитанные")
-            updated = (
-                db.session.query(Notification)
-                .filter_by(is_read=False)
-                .update({"is_read": True})
-            )
+            updated = db.session.execute(
+                update(Notification)
+                .where(Notification.is_read == False)
+                .values(is_read=True),
+                execution_options={"synchronize_session": False},
+            ).rowcount
             db.session.commit()
+            # После UPDATE непрочитанных не осталось — COUNT не нужен
+            _invalidate_notification_caches(unread_count=0)
 
             logger.info(f"Помечено как прочитано: {updated} уведомлений")
             message = (
@@ -322,7 +456,6 @@ def init_notification_routes(app: Flask) -> None:
             logger.error(
                 f"Ошибка при пометке всех уведомлений как прочитанных: {str(e)}"
             )
-            flash("Ошибка при обновлении уведомлений", "error")
             return (
                 jsonify({"status": "error", "message": f"Ошибка сервера: {str(e)}"}),
                 500,
@@ -332,41 +465,32 @@ def init_notification_routes(app: Flask) -> None:
     @login_required
     def clean_old_notifications() -> Any:
         """
-        Удаление прочитанных уведомлений старше 30 дней.
+        Запускает фоновое удаление прочитанных уведомлений старше 30 дней.
 
         Returns:
-            JSON с результатом операции.
+            JSON со статусом queued (202) или сообщением, что очистка уже идёт.
 
         Notes:
-            Асимптотическая сложность: O(n), где n — число уведомлений.
+            Запрос не ждёт удаления: оно выполняется пачками в отдельном потоке.
         """
-        try:
-            threshold = datetime.now(MOSCOW_TZ) - timedelta(days=30)
-            deleted = (
-                db.session.query(Notification)
-                .filter(
-                    Notification.is_read == True, Notification.created_at < threshold
-                )
-                .delete()
-            )
-            db.session.commit()
-
-            logger.info(f"Удалено {deleted} старых прочитанных уведомлений")
-            flash(f"Удалено {deleted} старых прочитанных уведомлений", "success")
-
-            return jsonify(
-                {"status": "success", "message": f"Удалено {deleted} уведомлений"}
+        if not _cleanup_lock.acquire(blocking=False):
+            return (
+                jsonify({"status": "running", "message": "Очистка уже выполняется"}),
+                409,
             )
-
+        try:
+            threading.Thread(target=_clean_old_notifications_task, daemon=True).start()
         except Exception as e:
-            db.session.rollback()
+            _cleanup_lock.release()
             logger.error(f"Ошибка при очистке уведомлений: {str(e)}")
-            flash("Ошибка при очистке уведомлений", "error")
             return (
                 jsonify({"status": "error", "message": f"Ошибка сервера: {str(e)}"}),
                 500,
             )
 
+        logger.info("Запущена фоновая очистка старых прочитанных уведомлений")
+        return jsonify({"status": "queued", "message": "Очистка запущена"}), 202
+
     @app.route("/notifications/clear", methods=["POST"])
     @login_required
     def clear_notifications() -> Any:
@@ -383,8 +507,11 @@ def init_notification_routes(app: Flask) -> None:
         for attempt in range(retries):
             session = Session()
             try:
-                deleted = session.query(Notification).delete()
+                deleted = session.query(Notification).delete(
+                    synchronize_session=False
+                )
                 session.commit()
+                _invalidate_notification_caches(unread_count=0)
                 logger.info(f"Все уведомления очищены, удалено: {deleted} записей")
                 return jsonify(
                     {"status": "success", "message": f"Удалено {deleted} уведомлений"}
@@ -456,9 +583,8 @@ def init_notification_routes(app: Flask) -> None:
             }
         """
         try:
-            unread_count = get_unread_notifications_count()
-            logger.debug(f"Количество непрочитанных уведомлений: {unread_count}")
-            recent_notifications = get_recent_notifications(limit=5)
+            unread_count, recent_notifications = get_notification_summary(limit=5)
+            logger.debug("Количество непрочитанных уведомлений: %s", unread_count)
 
             for notification in recent_notifications:
                 if "target_url" not in notification:
@@ -485,14 +611,14 @@ def init_notification_routes(app: Flask) -> None:
                         )
                     )
 
-            logger.debug(f"Последние уведомления: {recent_notifications}")
+            logger.debug("Последние уведомления: %s", recent_notifications)
             response_data = {
                 "status": "success",
                 "unread_count": int(unread_count) if unread_count is not None else 0,
                 "has_new": unread_count > 0,
                 "recent_notifications": recent_notifications,
             }
-            logger.debug(f"Ответ /check_new_notifications: {response_data}")
+            logger.debug("Ответ /check_new_notifications: %s", response_data)
             return jsonify(response_data)
         except Exception as e:
             logger.error(f"Ошибка проверки уведомлений: {str(e)}")
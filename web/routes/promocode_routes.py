@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Any
 
 from models.models import Promocode
-from web.routes.utils import get_unread_notifications_count, get_recent_notifications
+from web.routes.utils import strict_loading_options
 from web.app import db
 
 from utils.logger import get_logger
@@ -25,15 +25,16 @@ def init_promocode_routes(app: Flask) -> None:
         Returns:
             Рендеринг шаблона promocodes.html с данными промокодов.
         """
-        promocodes = db.session.query(Promocode).order_by(Promocode.id).all()
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
+        promocodes = (
+            db.session.query(Promocode)
+            .options(*strict_loading_options())
+            .order_by(Promocode.id)
+            .all()
+        )
         logger.info(f"Отображен список промокодов, всего: {len(promocodes)}")
         return render_template(
             "promocodes.html",
             promocodes=promocodes,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/promocode/<int:promocode_id>")
@@ -48,21 +49,19 @@ def init_promocode_routes(app: Flask) -> None:
         Returns:
             Рендеринг шаблона promocode_detail.html или редирект.
         """
-        promocode = db.session.get(Promocode, promocode_id)
+        promocode = db.session.get(
+            Promocode, promocode_id, options=strict_loading_options()
+        )
         if not promocode:
             flash("Промокод не найден")
             logger.warning(f"Промокод с ID {promocode_id} не найден")
             return redirect(url_for("promocodes"))
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         logger.info(f"Отображена детальная информация о промокоде ID {promocode_id}")
         return render_template(
             "promocode_detail.html",
             promocode=promocode,
             edit=False,
             new=False,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/promocode/<int:promocode_id>/edit", methods=["GET", "POST"])
@@ -77,7 +76,9 @@ def init_promocode_routes(app: Flask) -> None:
         Returns:
             Рендеринг шаблона promocode_detail.html или редирект.
         """
-        promocode = db.session.get(Promocode, promocode_id)
+        promocode = db.session.get(
+            Promocode, promocode_id, options=strict_loading_options()
+        )
         if not promocode:
             flash("Промокод не найден")
             logger.warning(f"Промокод с ID {promocode_id} не найден")
@@ -102,15 +103,11 @@ def init_promocode_routes(app: Flask) -> None:
                 db.session.rollback()
                 flash("Ошибка при обновлении данных")
                 logger.error(f"Ошибка обновления промокода {promocode_id}: {str(e)}")
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         return render_template(
             "promocode_detail.html",
             promocode=promocode,
             edit=True,
             new=False,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/promocode/<int:promocode_id>/delete", methods=["POST"])
@@ -175,13 +172,9 @@ def init_promocode_routes(app: Flask) -> None:
                 flash("Ошибка при создании промокода")
                 logger.error(f"Ошибка создания промокода: {str(e)}")
         promocode = Promocode(name="", discount=0, usage_quantity=0, is_active=True)
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         return render_template(
             "promocode_detail.html",
             promocode=promocode,
             edit=True,
             new=True,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
@@ -3,7 +3,7 @@ from flask_login import login_required
 from typing import Any
 
 from models.models import Tariff
-from web.routes.utils import get_unread_notifications_count, get_recent_notifications
+from web.routes.utils import strict_loading_options
 from web.app import db
 from utils.logger import get_logger
 
@@ -23,14 +23,15 @@ def init_tariff_routes(app: Flask) -> None:
         Returns:
             Рендеринг шаблона tariffs.html с данными тарифов.
         """
-        tariffs = db.session.query(Tariff).order_by(Tariff.id).all()
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
+        tariffs = (
+            db.session.query(Tariff)
+            .options(*strict_loading_options())
+            .order_by(Tariff.id)
+            .all()
+        )
         return render_template(
             "tariffs.html",
             tariffs=tariffs,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/tariff/<int:tariff_id>")
@@ -45,19 +46,15 @@ def init_tariff_routes(app: Flask) -> None:
         Returns:
             Рендеринг шаблона tariff_detail.html или редирект.
         """
-        tariff = db.session.get(Tariff, tariff_id)
+        tariff = db.session.get(Tariff, tariff_id, options=strict_loading_options())
         if not tariff:
             flash("Тариф не найден")
             return redirect(url_for("tariffs"))
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         return render_template(
             "tariff_detail.html",
             tariff=tariff,
             edit=False,
             new=False,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/tariff/<int:tariff_id>/edit", methods=["GET", "POST"])
@@ -72,7 +69,7 @@ def init_tariff_routes(app: Flask) -> None:
         Returns:
             Рендеринг шаблона tariff_detail.html или редирект.
         """
-        tariff = db.session.get(Tariff, tariff_id)
+        tariff = db.session.get(Tariff, tariff_id, options=strict_loading_options())
         if not tariff:
             flash("Тариф не найден")
             return redirect(url_for("tariffs"))
@@ -92,15 +89,11 @@ def init_tariff_routes(app: Flask) -> None:
                 db.session.rollback()
                 flash("Ошибка при обновлении данных")
                 logger.error(f"Ошибка обновления тарифа {tariff_id}: {str(e)}")
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         return render_template(
             "tariff_detail.html",
             tariff=tariff,
             edit=True,
             new=False,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/tariff/<int:tariff_id>/delete", methods=["POST"])
@@ -161,13 +154,9 @@ def init_tariff_routes(app: Flask) -> None:
         tariff = Tariff(
             name="", description="Описание тарифа", price=0.0, is_active=True
         )
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         return render_template(
             "tariff_detail.html",
             tariff=tariff,
             edit=True,
             new=True,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
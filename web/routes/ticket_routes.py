@@ -1,14 +1,14 @@
 from flask import Flask, request, render_template, redirect, url_for, flash
 from flask_login import login_required
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 from typing import Any, Optional
-import pytz
+from zoneinfo import ZoneInfo
 
 from models.models import Ticket, TicketStatus, User
 from web.routes.utils import (
-    get_unread_notifications_count,
-    get_recent_notifications,
     send_telegram_message_sync,
+    strict_loading_options,
 )
 from web.app import db
 from utils.logger import get_logger
@@ -17,7 +17,7 @@ from utils.logger import get_logger
 logger = get_logger(__name__)
 
 # Московский часовой пояс
-MOSCOW_TZ = pytz.timezone("Europe/Moscow")
+MOSCOW_TZ = ZoneInfo("Europe/Moscow")
 
 
 def format_ticket_status_notification(
@@ -54,7 +54,9 @@ def format_ticket_status_notification(
 ⏰ <i>Время изменения: {datetime.now(MOSCOW_TZ).strftime('%d.%m.%Y %H:%M:%S')}</i>"""
 
     logger.debug(
-        f"Сформировано сообщение об изменении статуса заявки #{ticket.id}:\n{message}"
+        "Сформировано сообщение об изменении статуса заявки #%s:\n%s",
+        ticket.id,
+        message,
     )
     return message.strip()
 
@@ -76,14 +78,19 @@ def init_ticket_routes(app: Flask) -> None:
         per_page = 10
 
         # Базовый запрос для получения заявок
-        query = db.session.query(Ticket).order_by(Ticket.created_at.desc())
+        # Имя автора выводится в каждой строке — загружаем пользователя сразу
+        query = (
+            db.session.query(Ticket)
+            .options(joinedload(Ticket.user), *strict_loading_options())
+            .order_by(Ticket.created_at.desc())
+        )
 
         # Фильтрация по статусу
         if status:
             try:
                 status_enum = TicketStatus(status)
                 query = query.filter(Ticket.status == status_enum)
-                logger.debug(f"Применён фильтр по статусу: {status}")
+                logger.debug("Применён фильтр по статусу: %s", status)
             except ValueError:
                 flash("Неверный статус", "error")
                 logger.warning(f"Неверный статус в запросе: {status}")
@@ -95,14 +102,10 @@ def init_ticket_routes(app: Flask) -> None:
             f"Найдено {len(tickets)} заявок на странице {page} после фильтрации"
         )
 
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         return render_template(
             "tickets.html",
             tickets=tickets,
             pagination=pagination,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/ticket/<int:ticket_id>")
@@ -117,7 +120,11 @@ def init_ticket_routes(app: Flask) -> None:
         Returns:
             Рендеринг шаблона ticket_detail.html или редирект.
         """
-        ticket = db.session.get(Ticket, ticket_id)
+        ticket = db.session.get(
+            Ticket,
+            ticket_id,
+            options=[joinedload(Ticket.user), *strict_loading_options()],
+        )
         if not ticket:
             flash("Заявка не найдена", "error")
             return redirect(url_for("tickets"))
@@ -130,16 +137,12 @@ def init_ticket_routes(app: Flask) -> None:
             ticket.updated_at.astimezone(MOSCOW_TZ) if ticket.updated_at else None
         )
 
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         return render_template(
             "ticket_detail.html",
             ticket=ticket,
             user=ticket.user,
             created_at_msk=created_at_msk,
             updated_at_msk=updated_at_msk,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/ticket/<int:ticket_id>/edit", methods=["GET", "POST"])
@@ -185,8 +188,6 @@ def init_ticket_routes(app: Flask) -> None:
                             if ticket.updated_at
                             else None
                         ),
-                        unread_notifications=get_unread_notifications_count(),
-                        recent_notifications=get_recent_notifications(),
                     )
 
                 # Проверка обязательного комментария для статуса "Закрыта"
@@ -206,8 +207,6 @@ def init_ticket_routes(app: Flask) -> None:
                             if ticket.updated_at
                             else None
                         ),
-                        unread_notifications=get_unread_notifications_count(),
-                        recent_notifications=get_recent_notifications(),
                     )
 
                 # Обновление полей
@@ -254,12 +253,8 @@ def init_ticket_routes(app: Flask) -> None:
                         if ticket.updated_at
                         else None
                     ),
-                    unread_notifications=get_unread_notifications_count(),
-                    recent_notifications=get_recent_notifications(),
                 )
 
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         return render_template(
             "ticket_detail.html",
             ticket=ticket,
@@ -270,8 +265,6 @@ def init_ticket_routes(app: Flask) -> None:
             updated_at_msk=(
                 ticket.updated_at.astimezone(MOSCOW_TZ) if ticket.updated_at else None
             ),
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/ticket/<int:ticket_id>/delete", methods=["POST"])
@@ -1,5 +1,6 @@
 import os
-from typing import Any, Optional
+from datetime import datetime
+from typing import Any, List, Optional
 
 from flask import (
     Flask,
@@ -11,6 +12,8 @@ from flask import (
     send_from_directory,
 )
 from flask_login import login_required
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload
 
 from models.models import User, update_invited_count
 
@@ -19,8 +22,7 @@ from web.routes.utils import (
     check_file_exists,
     allowed_avatar_file,
     custom_secure_filename,
-    get_recent_notifications,
-    get_unread_notifications_count,
+    strict_loading_options,
 )
 
 from utils.logger import get_logger
@@ -28,6 +30,46 @@ from utils.logger import get_logger
 # Тихая настройка логгера для модуля
 logger = get_logger(__name__)
 
+USERS_PER_PAGE = 10
+
+
+def _fetch_users_page(
+    after_reg_date: Optional[datetime], after_id: Optional[int], limit: int
+) -> List[User]:
+    """
+    Выбирает пользователей после курсора (reg_date, id), новые сначала.
+
+    Условие по кортежу (reg_date, id) — поиск по индексу ix_users_reg_date
+    (rowid входит в индекс), без пропуска OFFSET строк. Пользователи без даты
+    регистрации идут в конце, как NULL в ORDER BY reg_date DESC, и выбираются
+    отдельным запросом: сравнение кортежа с NULL ничего не находит.
+
+    Args:
+        after_reg_date: Дата регистрации последнего показанного пользователя.
+        after_id: ID последнего показанного пользователя (None — первая страница).
+        limit: Максимальное количество пользователей.
+
+    Returns:
+        Список пользователей страницы.
+    """
+    options = strict_loading_options()
+    users: List[User] = []
+    if after_id is None or after_reg_date is not None:
+        query = (
+            db.session.query(User).options(*options).filter(User.reg_date.isnot(None))
+        )
+        if after_id is not None:
+            query = query.filter(
+                tuple_(User.reg_date, User.id) < tuple_(after_reg_date, after_id)
+            )
+        users = query.order_by(User.reg_date.desc(), User.id.desc()).limit(limit).all()
+    if len(users) < limit:
+        query = db.session.query(User).options(*options).filter(User.reg_date.is_(None))
+        if after_id is not None and after_reg_date is None:
+            query = query.filter(User.id < after_id)
+        users += query.order_by(User.id.desc()).limit(limit - len(users)).all()
+    return users
+
 
 def init_user_routes(app: Flask) -> None:
     """Инициализация маршрутов для работы с пользователями."""
@@ -43,26 +85,36 @@ def init_user_routes(app: Flask) -> None:
     @login_required
     def users() -> Any:
         """
-        Отображение списка пользователей с пагинацией.
+        Отображение списка пользователей с пагинацией по курсору.
+
+        Args:
+            after_reg_date (optional): Дата регистрации последнего пользователя
+                предыдущей страницы (ISO 8601).
+            after_id (optional): ID последнего пользователя предыдущей страницы.
 
         Returns:
             Рендеринг шаблона users.html с данными пользователей.
         """
-        page = request.args.get("page", 1, type=int)
-        per_page = 10
-        users_pagination = (
-            db.session.query(User)
-            .order_by(User.reg_date.desc())
-            .paginate(page=page, per_page=per_page, error_out=False)
-        )
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
+        if "page" in request.args:
+            # Старые ссылки с номером страницы ведут на первую страницу
+            return redirect(url_for("users"))
+
+        after_id = request.args.get("after_id", type=int)
+        after_reg_date = request.args.get("after_reg_date", type=datetime.fromisoformat)
+        users = _fetch_users_page(after_reg_date, after_id, USERS_PER_PAGE + 1)
+
+        next_cursor = None
+        if len(users) > USERS_PER_PAGE:
+            users = users[:USERS_PER_PAGE]
+            last = users[-1]
+            next_cursor = {"after_id": last.id}
+            if last.reg_date is not None:
+                next_cursor["after_reg_date"] = last.reg_date.isoformat()
         return render_template(
             "users.html",
-            users=users_pagination.items,
-            pagination=users_pagination,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
+            users=users,
+            next_cursor=next_cursor,
+            is_first_page=after_id is None,
         )
 
     @app.route("/user/<int:user_id>")
@@ -77,30 +129,30 @@ def init_user_routes(app: Flask) -> None:
         Returns:
             Рендеринг шаблона user_detail.html или редирект.
         """
-        user = db.session.get(User, user_id)
+        user = db.session.get(
+            User,
+            user_id,
+            options=[joinedload(User.referrer), *strict_loading_options()],
+        )
         if not user:
             flash("Пользователь не найден")
             return redirect(url_for("users"))
+        referrer_name = (
+            user.referrer.full_name
+            if user.referrer_id and user.referrer
+            else "Не указано"
+        )
         if user.avatar and not check_file_exists(user.avatar):
             logger.warning(
                 f"Аватар пользователя {user_id} не найден или не читаем: {user.avatar}"
             )
             user.avatar = None
             db.session.commit()
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
-        referrer_name = (
-            user.referrer.full_name
-            if user.referrer_id and user.referrer
-            else "Не указано"
-        )
         return render_template(
             "user_detail.html",
             user=user,
             edit=False,
             referrer_name=referrer_name,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/user/<int:user_id>/edit", methods=["GET", "POST"])
@@ -212,8 +264,6 @@ def init_user_routes(app: Flask) -> None:
                 db.session.rollback()
                 flash("Ошибка при обновлении данных")
                 logger.error(f"Ошибка обновления пользователя {user_id}: {str(e)}")
-        unread_notifications = get_unread_notifications_count()
-        recent_notifications = get_recent_notifications()
         referrer_name = (
             user.referrer.full_name
             if user.referrer_id and user.referrer
@@ -224,8 +274,6 @@ def init_user_routes(app: Flask) -> None:
             user=user,
             edit=True,
             referrer_name=referrer_name,
-            unread_notifications=unread_notifications,
-            recent_notifications=recent_notifications,
         )
 
     @app.route("/user/<int:user_id>/delete_avatar", methods=["POST"])
@@ -1,15 +1,20 @@
 import asyncio
 import os
 import re
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import Awaitable, List, Dict, Optional, Any, Tuple
 
 from aiogram import Bot
-from sqlalchemy import desc
+from flask import current_app
+from sqlalchemy import bindparam, desc, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import raiseload
 
 from models.models import Notification
 from utils.bot_instance import get_bot
-from unicodedata import normalize
 
 from web.app import db
 
@@ -37,6 +42,91 @@ ALLOWED_HTML_TAGS = {
 }
 AVATAR_FOLDER = "/app/static/avatars"
 
+# Все отправки в Telegram из веба идут через один фоновый событийный цикл:
+# сессия aiohttp бота привязана к циклу, поэтому TCP/TLS-соединения с
+# api.telegram.org переиспользуются между запросами
+TELEGRAM_SEND_TIMEOUT = 30  # секунды
+_telegram_loop: Optional[asyncio.AbstractEventLoop] = None
+_telegram_loop_lock = threading.Lock()
+
+# Колонки для списка последних уведомлений; дата форматируется самой SQLite
+RECENT_NOTIFICATION_COLUMNS = (
+    Notification.id,
+    Notification.message,
+    func.strftime("%Y-%m-%d %H:%M", Notification.created_at).label("created_at_fmt"),
+    Notification.is_read,
+    Notification.user_id,
+    Notification.booking_id,
+    Notification.ticket_id,
+)
+# Тип уведомления определяется по метке в тексте, которую формирует бот:
+# один проход регулярного выражения вместо нескольких поисков подстроки
+_NOTIFICATION_KIND_RE = re.compile(r"Новый пользователь:|Новая бронь|Новая заявка")
+_NOTIFICATION_KINDS = {
+    "Новый пользователь:": ("user", "user_id", "/user/"),
+    "Новая бронь": ("booking", "booking_id", "/booking/"),
+    "Новая заявка": ("ticket", "ticket_id", "/ticket/"),
+}
+
+# Непрочитанные считаются не дальше этого значения: значку нужно только «99+»
+UNREAD_COUNT_CAP = 100
+
+# Запросы собираются один раз при импорте, LIMIT передаётся параметром
+_UNREAD_NOTIFICATIONS_COUNT = select(func.count()).select_from(
+    select(Notification.id)
+    .where(Notification.is_read == False)
+    .limit(UNREAD_COUNT_CAP)
+    .subquery()
+)
+_RECENT_NOTIFICATIONS = (
+    select(*RECENT_NOTIFICATION_COLUMNS)
+    .order_by(desc(Notification.created_at))
+    .limit(bindparam("limit"))
+)
+_NOTIFICATION_SUMMARY = (
+    select(
+        *RECENT_NOTIFICATION_COLUMNS,
+        _UNREAD_NOTIFICATIONS_COUNT.scalar_subquery().label("unread_count"),
+    )
+    .order_by(desc(Notification.created_at))
+    .limit(bindparam("limit"))
+)
+
+# Уведомления создаёт бот (другой процесс), поэтому счётчик непрочитанных и
+# последние уведомления кэшируются ненадолго: TTL ограничивает задержку
+# появления новых, изменения из веб-панели сбрасывают кэш сразу
+NOTIFICATIONS_CACHE_TTL = 10  # секунды
+_unread_count_cache: Optional[Tuple[float, int]] = None
+_recent_notifications_cache: Dict[int, Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+def _is_fresh(entry: Optional[Tuple[float, Any]]) -> bool:
+    """Проверяет, что запись кэша уведомлений существует и не устарела."""
+    return (
+        entry is not None and time.monotonic() - entry[0] < NOTIFICATIONS_CACHE_TTL
+    )
+
+
+def format_notification_time(value: Optional[datetime]) -> str:
+    """
+    Форматирует дату уведомления как "ГГГГ-ММ-ДД ЧЧ:ММ".
+
+    Собирается из полей datetime напрямую: формат фиксированный, а strftime
+    разбирает строку формата заново на каждой строке списка.
+
+    Args:
+        value: Дата создания уведомления.
+
+    Returns:
+        str: Отформатированная дата или "Неизвестно", если дата не задана.
+    """
+    if value is None:
+        return "Неизвестно"
+    return (
+        f"{value.year:04d}-{value.month:02d}-{value.day:02d} "
+        f"{value.hour:02d}:{value.minute:02d}"
+    )
+
 
 def allowed_file(filename: str) -> bool:
     """
@@ -111,7 +201,7 @@ def check_file_exists(filename: Optional[str]) -> bool:
         True
     """
     if not filename:
-        logger.info("check_file_exists: Пустое имя файла")
+        logger.debug("check_file_exists: Пустое имя файла")
         return False
     clean_filename = (
         filename.replace("avatars/", "")
@@ -122,8 +212,11 @@ def check_file_exists(filename: Optional[str]) -> bool:
     try:
         exists = os.path.exists(file_path)
         readable = os.access(file_path, os.R_OK) if exists else False
-        logger.info(
-            f"check_file_exists: Проверка пути {file_path}, существует: {exists}, читаем: {readable}"
+        logger.debug(
+            "check_file_exists: Проверка пути %s, существует: %s, читаем: %s",
+            file_path,
+            exists,
+            readable,
         )
         if exists and not readable:
             logger.warning(f"Файл {file_path} существует, но не читаем")
@@ -133,22 +226,58 @@ def check_file_exists(filename: Optional[str]) -> bool:
         return False
 
 
+def strict_loading_options() -> list:
+    """
+    Опции запроса, запрещающие ленивую загрузку связей в режиме отладки.
+
+    В debug любое обращение к незагруженной связи (в том числе из шаблона)
+    вызывает исключение, что сразу выявляет скрытые N+1. В продакшене опций нет.
+
+    Returns:
+        Список опций загрузчика для Query.options()/Session.get().
+    """
+    return [raiseload("*")] if current_app.debug else []
+
+
 def get_unread_notifications_count() -> int:
     """
     Получение количества непрочитанных уведомлений.
 
+    Счёт останавливается на UNREAD_COUNT_CAP: SQLite читает не больше этого
+    числа записей частичного индекса, а значок показывает «99+».
+
     Returns:
-        Количество непрочитанных уведомлений.
+        Количество непрочитанных уведомлений, но не больше UNREAD_COUNT_CAP.
 
     Example:
         >>> get_unread_notifications_count()
         5
     """
-    count = db.session.query(Notification).filter_by(is_read=False).count()
-    logger.info(f"Количество непрочитанных уведомлений: {count}")
+    global _unread_count_cache
+    if _is_fresh(_unread_count_cache):
+        return _unread_count_cache[1]
+
+    count = db.session.scalar(_UNREAD_NOTIFICATIONS_COUNT)
+    _unread_count_cache = (time.monotonic(), count)
+    logger.debug("Количество непрочитанных уведомлений: %s", count)
     return count
 
 
+def invalidate_notifications_cache(unread_count: Optional[int] = None) -> None:
+    """
+    Сбрасывает кэш счётчика и последних уведомлений после изменений в БД.
+
+    Args:
+        unread_count: Известное после изменения число непрочитанных (например, 0
+            после «прочитать все»); сохраняется в кэш вместо повторного COUNT.
+    """
+    global _unread_count_cache
+    _unread_count_cache = (
+        None if unread_count is None else (time.monotonic(), unread_count)
+    )
+    _recent_notifications_cache.clear()
+
+
 def get_recent_notifications(limit: int = 5) -> List[Dict[str, Any]]:
     """
     Возвращает последние уведомления в формате, подходящем для шаблона и AJAX.
@@ -163,43 +292,69 @@ def get_recent_notifications(limit: int = 5) -> List[Dict[str, Any]]:
         >>> get_recent_notifications(2)
         [{'id': 1, 'message': 'Новая заявка #1', 'created_at': '2025-07-30 13:00', ...}, ...]
     """
-    notifications = (
-        db.session.query(Notification)
-        .order_by(desc(Notification.created_at))
-        .limit(limit)
-        .all()
-    )
-    result = []
-    for n in notifications:
-        notification_type = "general"
-        target_url = "/notifications"
-        if "Новый пользователь:" in n.message and n.user_id:
-            notification_type = "user"
-            target_url = f"/user/{n.user_id}"
-        elif "Новая бронь" in n.message and n.booking_id:
-            notification_type = "booking"
-            target_url = f"/booking/{n.booking_id}"
-        elif "Новая заявка" in n.message and n.ticket_id:
-            notification_type = "ticket"
-            target_url = f"/ticket/{n.ticket_id}"
-
-        result.append(
-            {
-                "id": n.id,
-                "message": n.message,
-                "created_at": (
-                    n.created_at.strftime("%Y-%m-%d %H:%M")
-                    if isinstance(n.created_at, datetime)
-                    else n.created_at
-                ),
-                "is_read": n.is_read,
-                "type": notification_type,
-                "target_url": target_url,
-            }
-        )
+    cached = _recent_notifications_cache.get(limit)
+    if _is_fresh(cached):
+        return cached[1]
+
+    rows = db.session.execute(_RECENT_NOTIFICATIONS, {"limit": limit}).all()
+    result = [_format_recent_notification(row) for row in rows]
+    _recent_notifications_cache[limit] = (time.monotonic(), result)
     return result
 
 
+def get_notification_summary(limit: int = 5) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Возвращает счётчик непрочитанных и последние уведомления одним запросом.
+
+    Счётчик считается некоррелированным подзапросом в том же SELECT, что и
+    выборка последних уведомлений (SQLite вычисляет его один раз по частичному
+    индексу непрочитанных); если он уже есть в кэше, выполняется только выборка
+    (тоже кэшируемая), а при обоих свежих значениях запросов нет вовсе.
+
+    Нужна только опросу /notifications/check_new: страницы панели сводку не
+    рендерят и вызывать её не должны.
+
+    Args:
+        limit: Максимальное количество уведомлений (по умолчанию 5).
+
+    Returns:
+        Кортеж (количество непрочитанных, список словарей уведомлений).
+    """
+    global _unread_count_cache
+    if _is_fresh(_unread_count_cache):
+        return _unread_count_cache[1], get_recent_notifications(limit)
+
+    rows = db.session.execute(_NOTIFICATION_SUMMARY, {"limit": limit}).all()
+    count = rows[0].unread_count if rows else 0
+    result = [_format_recent_notification(row) for row in rows]
+    now = time.monotonic()
+    _unread_count_cache = (now, count)
+    _recent_notifications_cache[limit] = (now, result)
+    return count, result
+
+
+def _format_recent_notification(n: Row) -> Dict[str, Any]:
+    """Преобразует строку RECENT_NOTIFICATION_COLUMNS в словарь для шаблона и AJAX."""
+    notification_type = "general"
+    target_url = "/notifications"
+    match = _NOTIFICATION_KIND_RE.search(n.message)
+    if match:
+        kind, id_field, url_prefix = _NOTIFICATION_KINDS[match.group()]
+        target_id = getattr(n, id_field)
+        if target_id:
+            notification_type = kind
+            target_url = f"{url_prefix}{target_id}"
+
+    return {
+        "id": n.id,
+        "message": n.message,
+        "created_at": n.created_at_fmt,
+        "is_read": n.is_read,
+        "type": notification_type,
+        "target_url": target_url,
+    }
+
+
 def clean_html(text: str) -> str:
     """
     Очищает HTML-текст от неподдерживаемых Telegram тегов, сохраняя разрешенные теги и переносы строк.
@@ -230,6 +385,44 @@ def clean_html(text: str) -> str:
 _bot_instance: Optional[Bot] = None
 
 
+def _get_telegram_loop() -> asyncio.AbstractEventLoop:
+    """Возвращает фоновый цикл отправки в Telegram, запуская его при первом вызове."""
+    global _telegram_loop
+    with _telegram_loop_lock:
+        if _telegram_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="telegram-loop", daemon=True
+            ).start()
+            _telegram_loop = loop
+    return _telegram_loop
+
+
+def run_telegram_coroutine(
+    coro: Awaitable[Any], timeout: Optional[float] = TELEGRAM_SEND_TIMEOUT
+) -> Any:
+    """
+    Выполняет корутину в фоновом цикле Telegram и ждёт результат.
+
+    Args:
+        coro: Корутина, использующая бота (get_bot()).
+        timeout: Максимальное время ожидания в секундах; None — без ограничения.
+
+    Returns:
+        Результат корутины.
+
+    Raises:
+        concurrent.futures.TimeoutError: Если корутина не завершилась за timeout
+            (она при этом отменяется).
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_telegram_loop())
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
+
+
 async def send_telegram_message_async(telegram_id: int, message: str, bot: Bot) -> bool:
     """
     Асинхронно отправляет сообщение в Telegram.
@@ -253,6 +446,27 @@ async def send_telegram_message_async(telegram_id: int, message: str, bot: Bot)
         return False
 
 
+def send_telegram_message_background(telegram_id: int, message: str) -> None:
+    """
+    Ставит отправку сообщения в фоновый цикл Telegram и сразу возвращается.
+
+    Результат не ожидается: ошибки логирует send_telegram_message_async.
+
+    Args:
+        telegram_id: ID пользователя в Telegram.
+        message: Текст сообщения.
+    """
+    try:
+        asyncio.run_coroutine_threadsafe(
+            send_telegram_message_async(telegram_id, message, get_bot()),
+            _get_telegram_loop(),
+        )
+    except Exception as e:
+        logger.error(
+            f"Не удалось поставить отправку сообщения пользователю {telegram_id}: {str(e)}"
+        )
+
+
 def send_telegram_message_sync(telegram_id: int, message: str) -> bool:
     """
     Отправляет сообщение пользователю через Telegram в синхронном контексте.
@@ -268,22 +482,12 @@ def send_telegram_message_sync(telegram_id: int, message: str) -> bool:
         >>> send_telegram_message_sync(123456, "Hello!")
         True
     """
-    bot = get_bot()
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        success = loop.run_until_complete(
-            send_telegram_message_async(telegram_id, message, bot)
+        return run_telegram_coroutine(
+            send_telegram_message_async(telegram_id, message, get_bot())
         )
-        return success
     except Exception as e:
         logger.error(
             f"Ошибка в синхронной отправке сообщения пользователю {telegram_id}: {str(e)}"
         )
         return False
-    finally:
-        try:
-            loop.run_until_complete(bot.session.close())  # Закрываем сессию
-            loop.close()
-        except Exception as e:
-            logger.warning(f"Ошибка при закрытии сессии или цикла: {str(e)}")